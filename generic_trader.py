@@ -2,12 +2,19 @@ import MetaTrader5 as mt5
 import pandas as pd
 import numpy as np
 import time
+import sys
+import logging
 import argparse
 import importlib
 from datetime import datetime, timedelta
 import pytz # Added for timezone handling
 from strategies.base_strategy import BaseStrategy  # Import BaseStrategy from the strategies package
 
+try:
+    from scipy.signal import lfilter  # Optional: faster EMA recomputation
+except ImportError:
+    lfilter = None
+
 # ===== Configuration Constants =====
 
 # Account Configuration (Example - Should be secured)
@@ -59,14 +66,30 @@ POSITION_CONFIG = {
 class IndicatorCalculator:
     """Provides static methods for calculating technical indicators."""
 
+    @staticmethod
+    def _ema(prices, period):
+        """
+        EMA matching prices.ewm(span=period, adjust=False).mean().
+
+        The EMA is a single-pole IIR filter, so when scipy is installed it runs
+        through scipy.signal.lfilter, seeded with the first price the same way
+        pandas does. Series with gaps (NaN) keep using pandas for its NaN handling.
+        """
+        values = prices.to_numpy(dtype=np.float64)
+        if lfilter is None or np.isnan(values).any():
+            return prices.ewm(span=period, adjust=False).mean()
+        alpha = 2.0 / (period + 1)
+        smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * values[0]])
+        return pd.Series(smoothed, index=prices.index, name=prices.name)
+
     @staticmethod
     def calculate_tema(prices, period):
         """Calculate Triple Exponential Moving Average"""
         if prices.isnull().all() or len(prices) < period:
             return pd.Series(index=prices.index, dtype='float64')
-        ema1 = prices.ewm(span=period, adjust=False).mean()
-        ema2 = ema1.ewm(span=period, adjust=False).mean()
-        ema3 = ema2.ewm(span=period, adjust=False).mean()
+        ema1 = IndicatorCalculator._ema(prices, period)
+        ema2 = IndicatorCalculator._ema(ema1, period)
+        ema3 = IndicatorCalculator._ema(ema2, period)
         tema = (3 * ema1) - (3 * ema2) + ema3
         return tema
 
@@ -75,7 +98,7 @@ class IndicatorCalculator:
         """Calculate standard Exponential Moving Average"""
         if prices.isnull().all() or len(prices) < period:
             return pd.Series(index=prices.index, dtype='float64')
-        return prices.ewm(span=period, adjust=False).mean()
+        return IndicatorCalculator._ema(prices, period)
 
     @staticmethod
     def calculate_rsi(prices, period=14):
@@ -445,6 +468,10 @@ class DataFetcher:
                                 df[col] = np.nan
                         else:
                             df[output_col_name] = np.nan
+
+                # Fast/slow EMA gap, read directly by the crossover strategies
+                if 'fast_ema' in df.columns and 'slow_ema' in df.columns:
+                    df['ema_diff'] = df['fast_ema'] - df['slow_ema']
             else:
                 print("⚠️ DataFrame is empty, cannot calculate indicators.")
 
@@ -871,6 +898,9 @@ def main():
     args = parse_arguments()
     fixed_volume = args.volume  # Use the fixed volume from command line
     
+    # Strategy log messages go to stdout synchronously, in order with the trader's prints
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
     # Parse strategy config from JSON if provided
     strategy_config = {}
     if args.config:
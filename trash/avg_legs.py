@@ -5,13 +5,13 @@
 
 💡 It teaches:
 - How to fetch historical market data with MT5’s Python API
-- How to interpret DataFrame columns returned by MT5
+- How to interpret the fields of the rates array returned by MT5
 - How to segment price movement into 'legs' based on direction
 - How to measure and average the size of those legs
 """
 
 import MetaTrader5 as mt5
-import pandas as pd
+import numpy as np
 
 # === Step 1: Connect to MetaTrader 5 and fetch last 60 minutes of 1-minute candles ===
 symbol = "BTCUSD"                   # Instrument to analyze
@@ -27,52 +27,47 @@ rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, num_candles)
 # Shutdown MT5 connection after data is retrieved
 mt5.shutdown()
 
-# === Step 2: Convert raw rates to a pandas DataFrame for easier processing ===
-df = pd.DataFrame(rates)
+# === Step 2: Read fields straight from the raw rates ===
+# rates is a NumPy structured array; each field is already a numeric array,
+# so no DataFrame is needed.
 
-# 🗂️ df now contains these columns:
-# - df['time']         : Unix timestamp (start of each candle)
-# - df['open']         : Price at candle open
-# - df['high']         : Highest price during candle
-# - df['low']          : Lowest price during candle
-# - df['close']        : Price at candle close
-# - df['tick_volume']  : Number of ticks (price changes) in the candle
-# - df['spread']       : Spread at candle open
-# - df['real_volume']  : Actual traded volume (if supported by broker)
+# 🗂️ rates contains these fields:
+# - rates['time']         : Unix timestamp (start of each candle)
+# - rates['open']         : Price at candle open
+# - rates['high']         : Highest price during candle
+# - rates['low']          : Lowest price during candle
+# - rates['close']        : Price at candle close
+# - rates['tick_volume']  : Number of ticks (price changes) in the candle
+# - rates['spread']       : Spread at candle open
+# - rates['real_volume']  : Actual traded volume (if supported by broker)
 
 # === Step 3: Determine direction of each candle ===
-# We classify each candle as 'up' if it closed higher than the previous,
-# 'down' if it closed lower, and None if no change.
-df['direction'] = df['close'].diff().apply(
-    lambda x: 'up' if x > 0 else 'down' if x < 0 else None
-)
+# np.sign of the close-to-close change: +1 if a candle closed higher than the
+# previous one, -1 if it closed lower, and 0 if there was no change.
+close = rates['close']
+direction = np.sign(np.diff(close))  # direction[k] belongs to candle k + 1
 
 # === Step 4: Segment the data into legs of consistent direction ===
-legs = []                           # List to store the size of each leg
-start_price = df['close'].iloc[0]   # Starting point of the first leg
-current_dir = df['direction'].iloc[1]  # Initial direction
+# Candles that have a direction, and the direction of the one before each of them
+# (0 = none yet). A leg ends where the direction differs from the previous one;
+# the first candle only sets the initial direction.
+moved = np.flatnonzero(direction) + 1
+moved_dir = direction[moved - 1]
+prev_dir = np.concatenate(([0], moved_dir[:-1]))
+turns = moved[(moved_dir != prev_dir) & (moved >= 2)]
 
-# Loop through candles and segment into directional legs
-for i in range(2, len(df)):
-    dir_now = df['direction'].iloc[i]    # Current direction
-    price_now = df['close'].iloc[i]      # Current close price
-    
-    if dir_now != current_dir and dir_now is not None:
-        # When direction changes, calculate leg size and save it
-        leg_size = abs(price_now - start_price)
-        legs.append(leg_size)
-
-        # Start a new leg
-        start_price = price_now
-        current_dir = dir_now
+# Each leg runs from the previous turn (or the first candle) to the next turn
+starts = np.concatenate(([0], turns))
+legs = np.abs(np.diff(close[starts]))
 
 # Add the last leg if not already captured
-if len(legs) == 0 or start_price != df['close'].iloc[-1]:
-    legs.append(abs(df['close'].iloc[-1] - start_price))
+last_start = close[starts[-1]]
+if legs.size == 0 or last_start != close[-1]:
+    legs = np.append(legs, abs(close[-1] - last_start))
 
 # === Step 5: Calculate the average leg size ===
 # This tells us the average price movement before a reversal
-avg_leg_size = sum(legs) / len(legs) if legs else 0
+avg_leg_size = legs.mean() if legs.size else 0
 
 # 🖨️ Output the result
 print(f"📊 Average leg size over the last hour: {avg_leg_size:.2f} price units")
@@ -0,0 +1,176 @@
+"""
+Numeric kernels for the ADX breakout strategy (ai_slop_4).
+
+The ADX is built from four ewm(alpha=1/period, adjust=False) smoothers (TR, +DM,
+-DM and DX). Each one only needs its last value, so the whole indicator is carried
+in a small float64 state array and a new bar is folded in with a few scalar
+operations. The recurrence matches pandas' ewm, NaN handling included, which is
+why the kernels are not compiled with fastmath.
+
+State layout (ADX_STATE_SIZE values): prev_high, prev_low, prev_close, followed by
+(weighted, old_wt, nobs) for the TR, +DM, -DM and DX smoothers at offsets 3, 6, 9
+and 12.
+
+JIT-compiled by numba when it is installed (see _njit.py), plain Python otherwise.
+"""
+
+from math import copysign, fabs, inf, nan
+import numpy as np
+from strategies._njit import njit
+
+ADX_STATE_SIZE = 15
+
+
+def new_adx_state():
+    """
+    Streaming ADX state before the first bar: no previous bar, no smoother started.
+
+    Returns:
+        ndarray: float64 state array for adx_fold
+    """
+    state = np.full(ADX_STATE_SIZE, nan)
+    state[4::3] = 1.0  # old_wt
+    state[5::3] = 0.0  # nobs
+    return state
+
+
+@njit('float64(float64, float64)', cache=True)
+def safe_div(num, den):
+    """Divide like numpy/pandas: a zero denominator gives inf or NaN instead of raising"""
+    if den == 0.0:
+        if num == 0.0 or num != num:
+            return nan
+        return copysign(inf, num)
+    return num / den
+
+
+@njit('float64(float64[:], int64, float64, float64, int64)', cache=True)
+def ewm_step(state, k, value, alpha, min_periods):
+    """
+    Advance ewm(alpha=alpha, min_periods=min_periods, adjust=False).mean() by one value.
+
+    Args:
+        state (ndarray): ADX state, the smoother lives in state[k:k+3]
+        k (int): Offset of the smoother in the state
+        value (float): New input value (NaN is skipped, as in pandas)
+        alpha (float): Smoothing factor
+        min_periods (int): Observations required before a value is emitted
+
+    Returns:
+        float: Smoothed value, NaN until min_periods values have been observed
+    """
+    weighted = state[k]
+    old_wt = state[k + 1]
+    nobs = state[k + 2]
+    is_observation = value == value
+    if is_observation:
+        nobs += 1
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if is_observation:
+            if weighted != value:
+                weighted = (old_wt * weighted + alpha * value) / (old_wt + alpha)
+            old_wt = 1.0
+    elif is_observation:
+        weighted = value
+    state[k] = weighted
+    state[k + 1] = old_wt
+    state[k + 2] = nobs
+    return weighted if nobs >= min_periods else nan
+
+
+@njit('UniTuple(float64, 3)(float64[:], float64, float64, float64, int64, int64)', cache=True)
+def adx_step(state, high, low, close, period, smooth):
+    """
+    Fold one bar into the ADX state.
+
+    Args:
+        state (ndarray): ADX state, updated in place
+        high, low, close (float): The bar's prices
+        period (int): ADX period (TR/DM smoothing)
+        smooth (int): ADX smoothing period (DX smoothing)
+
+    Returns:
+        tuple: (adx, di_plus, di_minus) for the bar
+    """
+    prev_high = state[0]
+    prev_low = state[1]
+    prev_close = state[2]
+    if prev_close != prev_close:
+        prev_close = close  # First bar: no previous close
+
+    # True Range is max of (high-low, abs(high-prev_close), abs(low-prev_close))
+    tr = max(high - low, fabs(high - prev_close), fabs(low - prev_close))
+
+    # Directional Movement (a tie goes to -DM)
+    up_move = high - prev_high
+    down_move = prev_low - low
+    if up_move < 0:
+        up_move = 0.0
+    if down_move < 0:
+        down_move = 0.0
+    pos_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+    neg_dm = down_move if down_move > pos_dm and down_move > 0 else 0.0
+
+    state[0] = high
+    state[1] = low
+    state[2] = close
+
+    alpha = 1.0 / period
+    smoothed_tr = ewm_step(state, 3, tr, alpha, period)
+    smoothed_pos_dm = ewm_step(state, 6, pos_dm, alpha, period)
+    smoothed_neg_dm = ewm_step(state, 9, neg_dm, alpha, period)
+
+    di_plus = safe_div(100 * smoothed_pos_dm, smoothed_tr)
+    di_minus = safe_div(100 * smoothed_neg_dm, smoothed_tr)
+    dx = safe_div(100 * fabs(di_plus - di_minus), di_plus + di_minus)
+    adx = ewm_step(state, 12, dx, 1.0 / smooth, smooth)
+    return adx, di_plus, di_minus
+
+
+@njit('UniTuple(float64, 3)(float64[:], float64[:], float64[:], float64[:], int64, int64)', cache=True)
+def adx_fold(state, high, low, close, period, smooth):
+    """
+    Fold a run of bars into the ADX state.
+
+    Args:
+        state (ndarray): ADX state, updated in place
+        high, low, close (ndarray): Prices of the bars, oldest first
+        period (int): ADX period
+        smooth (int): ADX smoothing period
+
+    Returns:
+        tuple: (adx, di_plus, di_minus) for the last bar (NaN when no bars were given)
+    """
+    adx = nan
+    di_plus = nan
+    di_minus = nan
+    for i in range(high.shape[0]):
+        adx, di_plus, di_minus = adx_step(state, high[i], low[i], close[i], period, smooth)
+    return adx, di_plus, di_minus
+
+
+@njit('UniTuple(float64[:], 3)(float64[:], float64[:], float64[:], int64, int64)', cache=True)
+def adx_wilder(high, low, close, period, smooth):
+    """
+    Wilder ADX over a full price history, in a single pass.
+
+    Args:
+        high, low, close (ndarray): Price history, oldest first
+        period (int): ADX period
+        smooth (int): ADX smoothing period
+
+    Returns:
+        tuple: (adx, di_plus, di_minus) float64 arrays, NaN during warm-up
+    """
+    n = high.shape[0]
+    adx = np.empty(n)
+    di_plus = np.empty(n)
+    di_minus = np.empty(n)
+    state = np.full(ADX_STATE_SIZE, nan)
+    for k in range(3, ADX_STATE_SIZE, 3):
+        state[k + 1] = 1.0
+        state[k + 2] = 0.0
+    for i in range(n):
+        adx[i], di_plus[i], di_minus[i] = adx_step(state, high[i], low[i], close[i], period, smooth)
+    return adx, di_plus, di_minus
@@ -0,0 +1,192 @@
+"""
+Numeric kernels for the EMA crossover strategy.
+
+Each kernel works on raw float64 arrays (the fast_ema/slow_ema/ema_diff/close columns)
+so it can be JIT-compiled by numba (see _njit.py). Without numba they still
+run, just as plain Python.
+
+The kernels declare explicit signatures, so numba compiles them when this module
+is imported (and caches the result on disk) rather than on the first trading tick.
+"""
+
+from math import fabs
+import numpy as np
+from strategies._njit import njit
+
+
+@njit('float64(float64[:], int64)', cache=True)
+def slope(values, periods):
+    """
+    Least-squares slope of the last `periods` values against x = 0..periods-1.
+
+    Args:
+        values (ndarray): float64 series
+        periods (int): Number of trailing values to fit
+
+    Returns:
+        float: Slope per candle (0.0 when there are fewer than `periods` values)
+    """
+    n = values.shape[0]
+    if n < periods:
+        return 0.0
+
+    # For x = 0..2 the fit reduces to half the end-to-end change
+    if periods == 3:
+        return 0.5 * (values[n - 1] - values[n - 3])
+
+    centre = (periods - 1) / 2.0
+    num = 0.0
+    den = 0.0
+    for k in range(periods):
+        x = k - centre
+        num += x * values[n - periods + k]
+        den += x * x
+    return num / den
+
+
+@njit('int8[:](float64[:])', cache=True)
+def crossover_codes(diff):
+    """
+    Encode the crossover between each pair of consecutive candles.
+
+    The fast-minus-slow difference is packed into two sign masks (above: d > 0,
+    below: sign bit set). A bit that flips between candles (XOR) and is set on the
+    later candle marks a crossover in that direction, so no per-candle branching
+    is needed.
+
+    Args:
+        diff (ndarray): Fast EMA minus slow EMA
+
+    Returns:
+        ndarray: int8 codes, one per transition (len - 1): 1 = fast crossed above
+                 slow (BUY), -1 = fast crossed below slow (SELL), 0 = no crossover
+    """
+    above = diff > 0
+    below = np.signbit(diff)
+    up = (above[:-1] ^ above[1:]) & above[1:]
+    down = (below[:-1] ^ below[1:]) & below[1:]
+    return up.astype(np.int8) - down.astype(np.int8)
+
+
+@njit('Tuple((int64, int64, boolean))(float64[:], int64, boolean, boolean)', cache=True)
+def detect_crossover(diff, lookback, buy_allowed, sell_allowed):
+    """
+    Scan the last `lookback` candles, most recent first, for an EMA crossover.
+
+    Args:
+        diff (ndarray): Fast EMA minus slow EMA
+        lookback (int): Number of candle-to-candle transitions to check
+        buy_allowed (bool): Whether a bullish crossover may be returned
+        sell_allowed (bool): Whether a bearish crossover may be returned
+
+    Returns:
+        tuple: (candles_ago, direction, any_crossover) where direction is 1 for BUY,
+               -1 for SELL and 0 (with candles_ago -1) when no allowed crossover was found
+    """
+    codes = crossover_codes(diff[diff.shape[0] - lookback - 1:])
+    any_crossover = False
+    for i in range(1, lookback + 1):
+        code = codes[lookback - i]
+        if code != 0:
+            any_crossover = True
+            if (code > 0 and buy_allowed) or (code < 0 and sell_allowed):
+                return i, int(code), True
+    return -1, 0, any_crossover
+
+
+@njit('boolean(float64, float64, float64)', cache=True)
+def slope_ok_buy(fast_slope, slow_slope, min_slope):
+    """
+    BUY slope rule: the fast EMA must be rising; when both EMAs are relatively
+    flat, a non-falling fast EMA with a slow EMA not clearly falling is enough.
+    """
+    half = min_slope / 2
+    if fabs(fast_slope) < half and fabs(slow_slope) < half:
+        return fast_slope >= 0 and slow_slope > -min_slope
+    return fast_slope > 0
+
+
+@njit('boolean(float64, float64, float64)', cache=True)
+def slope_ok_sell(fast_slope, slow_slope, min_slope):
+    """
+    SELL slope rule: the fast EMA must be falling; when both EMAs are relatively
+    flat, a non-rising fast EMA with a slow EMA not clearly rising is enough.
+    """
+    half = min_slope / 2
+    if fabs(fast_slope) < half and fabs(slow_slope) < half:
+        return fast_slope <= 0 and slow_slope < min_slope
+    return fast_slope < 0
+
+
+@njit('Tuple((boolean, boolean, boolean, float64))'
+      '(float64[:], float64[:], float64[:], boolean, int64, float64, float64, float64)', cache=True)
+def signal_checks(fast, slow, close, is_buy, slope_periods, min_slope, min_separation, inv_point):
+    """
+    Slope, separation and price confirmation for a signal, plus its strength in points.
+
+    All checks read the same last values, so they are evaluated in one pass with a
+    single branch on the direction.
+
+    Args:
+        fast (ndarray): Fast EMA values
+        slow (ndarray): Slow EMA values
+        close (ndarray): Close prices
+        is_buy (bool): True for a BUY signal, False for SELL
+        slope_periods (int): Periods used for the slope fit
+        min_slope (float): Minimum slope for trend direction
+        min_separation (float): Minimum EMA separation in points
+        inv_point (float): Reciprocal of the symbol point size
+
+    Returns:
+        tuple: (slope_ok, sep_ok, price_ok, diff_points)
+    """
+    diff = fast[-1] - slow[-1]
+    diff_points = fabs(diff * inv_point)
+    has_slope = fast.shape[0] >= slope_periods
+
+    if is_buy:
+        slope_ok = has_slope and slope_ok_buy(slope(fast, slope_periods), slope(slow, slope_periods), min_slope)
+        sep_ok = diff > 0 and diff_points >= min_separation
+        price_ok = close[-1] > slow[-1]
+    else:
+        slope_ok = has_slope and slope_ok_sell(slope(fast, slope_periods), slope(slow, slope_periods), min_slope)
+        sep_ok = diff < 0 and diff_points >= min_separation
+        price_ok = close[-1] < slow[-1]
+
+    return slope_ok, sep_ok, price_ok, diff_points
+
+
+@njit('Tuple((int64, int64, boolean, boolean, boolean, float64))'
+      '(float64[:], float64[:], float64[:], float64[:], int64, boolean, boolean, int64, float64, float64, float64)',
+      cache=True)
+def entry_signal(fast, slow, diff, close, lookback, buy_allowed, sell_allowed,
+                 slope_periods, min_slope, min_separation, inv_point):
+    """
+    Full entry check for one bar: recent-crossover scan followed by the signal filters.
+
+    Fuses detect_crossover and signal_checks so the entry path needs a single call.
+
+    Args:
+        fast (ndarray): Fast EMA values
+        slow (ndarray): Slow EMA values
+        diff (ndarray): Fast EMA minus slow EMA
+        close (ndarray): Close prices
+        lookback (int): Number of candle-to-candle transitions to scan
+        buy_allowed (bool): Whether a bullish crossover may be returned
+        sell_allowed (bool): Whether a bearish crossover may be returned
+        slope_periods (int): Periods used for the slope fit
+        min_slope (float): Minimum slope for trend direction
+        min_separation (float): Minimum EMA separation in points
+        inv_point (float): Reciprocal of the symbol point size
+
+    Returns:
+        tuple: (direction, candles_ago, slope_ok, sep_ok, price_ok, diff_points) where
+               direction is 1 for BUY, -1 for SELL and 0 when there is no allowed crossover
+    """
+    candles_ago, direction, _ = detect_crossover(diff, lookback, buy_allowed, sell_allowed)
+    if direction == 0:
+        return 0, -1, False, False, False, 0.0
+
+    slope_ok, sep_ok, price_ok, diff_points = signal_checks(
+        fast, slow, close, direction > 0, slope_periods, min_slope, min_separation, inv_point)
+    return direction, candles_ago, slope_ok, sep_ok, price_ok, diff_points
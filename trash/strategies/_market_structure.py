@@ -0,0 +1,114 @@
+"""
+Swing point detection kernel for the market structure strategies.
+
+The scan runs over raw float64 arrays so it can be JIT-compiled by numba
+(see _njit.py). Without numba it still runs, just as plain Python.
+"""
+
+import numpy as np
+from strategies._njit import njit
+
+
+@njit(cache=True)
+def detect_swings(highs, lows, lookback, min_size, atr):
+    """
+    Find swing highs and lows in a single forward pass.
+    
+    Mirrors the rules of AISlope3Strategy._find_swing_points: a candle is a swing
+    point when it beats its neighbours (fewer checks for the last 2 candles) and
+    stands out from the surrounding window by at least the dynamic minimum size.
+    
+    Args:
+        highs (ndarray): float64 series used for swing highs
+        lows (ndarray): float64 series used for swing lows
+        lookback (int): Adaptive lookback already clamped by the caller
+        min_size (float): Minimum swing size in price units
+        atr (float): Latest ATR value
+        
+    Returns:
+        tuple: (high_indices, low_indices) as int64 arrays in ascending order
+    """
+    n = len(highs)
+    high_idx = np.empty(n, dtype=np.int64)
+    low_idx = np.empty(n, dtype=np.int64)
+    n_high = 0
+    n_low = 0
+    
+    # Min required lookback for the last few candles
+    min_lookback = 2
+    comparison_window = min(lookback, 5)
+    base_min_size = min(min_size, atr * 0.1)
+    
+    for i in range(lookback, n - min_lookback):
+        # For candles near the end, reduce the forward lookback requirement
+        forward_lookback = min(lookback, n - i - 1)
+        
+        # Last 2 candles get special treatment
+        is_recent = (n - 1 - i) <= 2
+        required_checks = 1 if is_recent else min(2, lookback)
+        back_checks = min(required_checks, lookback)
+        forward_checks = min(required_checks, forward_lookback)
+        
+        dynamic_min_size = base_min_size * 0.5 if is_recent else base_min_size
+        left_start = max(0, i - comparison_window)
+        right_end = min(n, i + comparison_window + 1)
+        
+        # Swing high: strictly above the neighbours on both sides
+        value = highs[i]
+        is_swing_high = True
+        for j in range(1, back_checks + 1):
+            if value <= highs[i - j]:
+                is_swing_high = False
+                break
+        if is_swing_high:
+            for j in range(1, forward_checks + 1):
+                if i + j < n and value <= highs[i + j]:
+                    is_swing_high = False
+                    break
+        if is_swing_high:
+            left_max = value
+            if left_start < i:
+                left_max = highs[left_start]
+                for k in range(left_start + 1, i):
+                    if highs[k] > left_max:
+                        left_max = highs[k]
+            right_max = value
+            if i + 1 < right_end:
+                right_max = highs[i + 1]
+                for k in range(i + 2, right_end):
+                    if highs[k] > right_max:
+                        right_max = highs[k]
+            if max(value - left_max, value - right_max) >= dynamic_min_size:
+                high_idx[n_high] = i
+                n_high += 1
+        
+        # Swing low: strictly below the neighbours on both sides
+        value = lows[i]
+        is_swing_low = True
+        for j in range(1, back_checks + 1):
+            if value >= lows[i - j]:
+                is_swing_low = False
+                break
+        if is_swing_low:
+            for j in range(1, forward_checks + 1):
+                if i + j < n and value >= lows[i + j]:
+                    is_swing_low = False
+                    break
+        if is_swing_low:
+            left_min = value
+            if left_start < i:
+                left_min = lows[left_start]
+                for k in range(left_start + 1, i):
+                    if lows[k] < left_min:
+                        left_min = lows[k]
+            right_min = value
+            if i + 1 < right_end:
+                right_min = lows[i + 1]
+                for k in range(i + 2, right_end):
+                    if lows[k] < right_min:
+                        right_min = lows[k]
+            if max(left_min - value, right_min - value) >= dynamic_min_size:
+                low_idx[n_low] = i
+                n_low += 1
+    
+    return high_idx[:n_high], low_idx[:n_low]
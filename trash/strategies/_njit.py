@@ -0,0 +1,19 @@
+"""
+Optional numba support for strategy kernels.
+
+Import njit from here instead of from numba directly. When numba is installed
+kernels are JIT-compiled; otherwise the decorator is a no-op and the same code
+runs as plain Python on numpy arrays.
+"""
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports both @njit and @njit(...))"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -2,8 +2,11 @@ import MetaTrader5 as mt5
 import pandas as pd
 import numpy as np
 from strategies.base_strategy import BaseStrategy
+from strategies._market_structure import detect_swings
 import sys
 import os
+from collections import deque
+from itertools import islice
 from datetime import datetime, timedelta
 
 # Add parent directory to path to import needed functions
@@ -38,6 +41,70 @@ AI_SLOP_3_CONFIG = {
     'REQUIRED_DATA_CANDLES': 50,   # Minimum candles required for analysis
 }
 
+def ema_alignment_grid(close, periods, structure_bullish=0, structure_bearish=0,
+                       ms_bullish=True, ms_bearish=True, ema_grid=None, last_only=False):
+    """
+    Evaluate the EMA trend-alignment rules for every (fast, slow) period pair at once.
+    
+    All candidate EMAs are computed once into a (T, K) array and every pair is compared
+    through broadcasting, so an N x M parameter sweep is a single vectorized pass instead
+    of N * M strategy runs.
+    
+    Without ema_grid the EMAs are a full ewm(adjust=False) over close, i.e. seeded from
+    the first close passed in. The live strategy carries its EMAs across fetch windows
+    (see AISlope3Strategy._streaming_ema), so to reproduce its decisions pass those
+    values as ema_grid, as evaluate_ema_grid does.
+    
+    Args:
+        close (Series): Close prices
+        periods (list): Candidate EMA periods (K values)
+        structure_bullish: Count of bullish market structure factors (trend up, higher highs,
+                           short-term up) - scalar or array of length T
+        structure_bearish: Count of bearish market structure factors - scalar or length T
+        ms_bullish: Whether market structure confirms a long (higher highs or uptrend)
+        ms_bearish: Whether market structure confirms a short (lower lows or downtrend)
+        ema_grid (ndarray, optional): Precomputed (T, K) EMA values, one column per period
+        last_only (bool): Only evaluate the last bar (structure arguments must then be
+                          scalars or refer to the last bar)
+        
+    Returns:
+        ndarray: int8 array of shape (T, K, K) indexed [bar, fast, slow] with
+                 1 for a long signal, -1 for a short signal and 0 for no trade
+                 (shape (1, K, K) with last_only)
+    """
+    if ema_grid is None:
+        ema_grid = np.column_stack([
+            close.ewm(span=period, adjust=False).mean().values for period in periods
+        ])
+    
+    # Slope direction over 2 bars (iloc[-1] vs iloc[-3]). As in _evaluate_entry_conditions
+    # the slope is flat until there are more than 3 bars.
+    if last_only:
+        slope = ema_grid[-1:] - ema_grid[-3:-2] if len(ema_grid) > 3 else np.zeros_like(ema_grid[-1:])
+        ema_grid = ema_grid[-1:]
+    else:
+        slope = np.zeros_like(ema_grid)
+        slope[3:] = ema_grid[3:] - ema_grid[1:-2]
+    rising = slope > 0
+    falling = slope < 0
+    
+    # EMA position for every (fast, slow) pair: shape (T, K, K)
+    ema_bullish = ema_grid[:, :, None] > ema_grid[:, None, :]
+    ema_bearish = ema_grid[:, :, None] < ema_grid[:, None, :]
+    
+    structure_bullish = np.reshape(structure_bullish, (-1, 1, 1))
+    structure_bearish = np.reshape(structure_bearish, (-1, 1, 1))
+    bullish_factors = (ema_bullish.astype(np.int8) + rising[:, :, None] + rising[:, None, :]
+                       + structure_bullish)
+    bearish_factors = (ema_bearish.astype(np.int8) + falling[:, :, None] + falling[:, None, :]
+                       + structure_bearish)
+    
+    can_go_long = (bullish_factors >= 3) & ema_bullish & np.reshape(ms_bullish, (-1, 1, 1))
+    can_go_short = (bearish_factors >= 3) & ema_bearish & np.reshape(ms_bearish, (-1, 1, 1))
+    
+    # Long takes precedence, as in _evaluate_entry_conditions
+    return np.where(can_go_long, 1, np.where(can_go_short, -1, 0)).astype(np.int8)
+
 class AISlope3Strategy(BaseStrategy):
     """
     AI Slope 3 Strategy based on EMA and Market Structure.
@@ -64,6 +131,15 @@ class AISlope3Strategy(BaseStrategy):
         self.indicators = {}
         self.market_structure = {}
         self.entry_decision = None
+        
+        # Raw numpy views of the latest close/indicator columns (set in calculate_indicators)
+        self._close_arr = None
+        self._atr_arr = None
+        self._ema_fast_arr = None
+        self._ema_slow_arr = None
+        
+        # Streaming EMA state per period: (ring of closed-candle EMAs, last EMA, last candle time)
+        self._ema_states = {}
         self.price_levels = {'entry': None, 'stop': None, 'tp': None}
         self.last_processed_candle_time = None
         self.last_trade_close_time = None
@@ -85,14 +161,70 @@ class AISlope3Strategy(BaseStrategy):
         fast_ema_period = self.config['FAST_EMA']
         slow_ema_period = self.config['SLOW_EMA']
         
-        self.indicators[f'ema{fast_ema_period}'] = self._calculate_ema(self.data['close'], fast_ema_period)
-        self.indicators[f'ema{slow_ema_period}'] = self._calculate_ema(self.data['close'], slow_ema_period)
+        # Cache raw numpy views so per-bar scalar reads skip the pandas indexer
+        self._close_arr = self.data['close'].values
+        self._atr_arr = self.indicators['atr'].values
+        self._ema_fast_arr = self._streaming_ema(fast_ema_period)
+        self._ema_slow_arr = self._streaming_ema(slow_ema_period)
+        
+        self.indicators[f'ema{fast_ema_period}'] = pd.Series(self._ema_fast_arr, index=self.data.index)
+        self.indicators[f'ema{slow_ema_period}'] = pd.Series(self._ema_slow_arr, index=self.data.index)
         
         # Analyze market structure (swing highs/lows)
         self._analyze_market_structure()
         
         return True
     
+    def _streaming_ema(self, period):
+        """
+        Calculate EMA values aligned with self.data, updating incrementally between ticks.
+        
+        Closed candles are folded into a running EMA one at a time
+        (ema = alpha * close + (1 - alpha) * ema) and kept in a fixed-size ring, so only
+        new candles and the still-forming last candle are computed on each update. Falls
+        back to a full recompute on the first call, after reset_signal_state, or when the
+        new data doesn't continue from the last folded candle.
+
+        Because the running EMA carries over between fetches, it is not re-seeded from
+        the first close of each sliding window (as a full ewm over the window would be):
+        it matches an EMA over the full history instead. Values near the start of the
+        window, and occasionally an entry decision, can therefore differ from a
+        per-window recompute.
+
+        Args:
+            period (int): EMA period
+            
+        Returns:
+            ndarray: EMA values, one per row of self.data
+        """
+        closes = self._close_arr
+        index = self.data.index
+        n = len(closes)
+        alpha = 2.0 / (period + 1)
+        state = self._ema_states.get(period)
+        
+        if state is not None:
+            ring, ema, last_time = state
+            pos = index.get_indexer([last_time])[0]
+            
+            # The ring must still cover every closed candle in the current window
+            if pos >= 0 and len(ring) >= pos + 1 and ring.maxlen >= n:
+                for close in closes[pos + 1:n - 1]:
+                    ema = alpha * close + (1 - alpha) * ema
+                    ring.append(ema)
+                self._ema_states[period] = (ring, ema, index[-2])
+                
+                values = np.empty(n)
+                values[:n - 1] = np.fromiter(islice(ring, len(ring) - (n - 1), None), dtype=np.float64, count=n - 1)
+                values[-1] = alpha * closes[-1] + (1 - alpha) * ema
+                return values
+        
+        # Full recompute; the forming candle is excluded from the stored state
+        values = self._calculate_ema(self.data['close'], period).values
+        ring = deque(values[:-1], maxlen=max(n, self.get_required_data_count()))
+        self._ema_states[period] = (ring, values[-2], index[-2])
+        return values
+    
     def _calculate_ema(self, prices, period):
         """Calculate Exponential Moving Average"""
         if len(prices) < period:
@@ -139,7 +271,7 @@ class AISlope3Strategy(BaseStrategy):
             
         # Get parameters
         lookback = self.config['SWING_LOOKBACK']
-        min_swing_size = self.config['MIN_SWING_SIZE_ATR'] * self.indicators['atr'].iloc[-1]
+        min_swing_size = self.config['MIN_SWING_SIZE_ATR'] * self._atr_arr[-1]
         
         # Identify swing highs and lows
         highs, lows = self._find_swing_points(lookback, min_swing_size)
@@ -305,105 +437,22 @@ class AISlope3Strategy(BaseStrategy):
             swing_high_series = self.data['high']
             swing_low_series = self.data['low']
         
-        # Initialize lists for swing points
-        swing_highs = []
-        swing_lows = []
+        # Latest ATR, read once for all the size thresholds below
+        current_atr = self._atr_arr[-1]
         
         # For smaller timeframes, use a more adaptive approach to swing detection
         # Use a smaller lookback for minute-level data while still requiring some confirmation
         actual_lookback = min(lookback, max(3, len(swing_high_series) // 30))  # More adaptive lookback
         
-        # Allow swing detection in more recent candles by reducing the forward lookback for newer candles
         data_length = len(swing_high_series)
         
-        # Min required lookback for first few candles
-        min_lookback = 2
-        
-        # Skip the first few candles that can't be properly analyzed
-        for i in range(actual_lookback, data_length - min_lookback):
-            # For candles near the end, reduce the forward lookback requirement
-            forward_lookback = min(actual_lookback, data_length - i - 1)
-            
-            # Special case for recent candles: reduce requirements
-            is_recent = (data_length - 1 - i) <= 2  # Last 2 candles get special treatment
-            required_checks = 1 if is_recent else min(2, actual_lookback)
-            
-            # Check for swing high - more relaxed criteria near the end of the data
-            is_swing_high = True
-            
-            # Backward check (requires full lookback)
-            for j in range(1, min(required_checks, actual_lookback) + 1):
-                if swing_high_series.iloc[i] <= swing_high_series.iloc[i-j]:
-                    is_swing_high = False
-                    break
-                    
-            # Forward check (adaptive lookback)
-            if is_swing_high and forward_lookback > 0:
-                for j in range(1, min(required_checks, forward_lookback) + 1):
-                    if i+j < data_length and swing_high_series.iloc[i] <= swing_high_series.iloc[i+j]:
-                        is_swing_high = False
-                        break
-            
-            # Check for swing low - more relaxed criteria near the end of the data
-            is_swing_low = True
-            
-            # Backward check (requires full lookback)
-            for j in range(1, min(required_checks, actual_lookback) + 1):
-                if swing_low_series.iloc[i] >= swing_low_series.iloc[i-j]:
-                    is_swing_low = False
-                    break
-                    
-            # Forward check (adaptive lookback)
-            if is_swing_low and forward_lookback > 0:
-                for j in range(1, min(required_checks, forward_lookback) + 1):
-                    if i+j < data_length and swing_low_series.iloc[i] >= swing_low_series.iloc[i+j]:
-                        is_swing_low = False
-                        break
-            
-            # For small timeframes, even minor swings can be significant
-            # Add valid swing points that meet minimum size requirement
-            if is_swing_high:
-                # Use a smaller window for size comparison on smaller timeframes
-                comparison_window = min(actual_lookback, 5)
-                
-                # Check size against surrounding candles
-                left_values = swing_high_series.iloc[max(0, i-comparison_window):i].values
-                right_values = swing_high_series.iloc[i+1:min(data_length, i+comparison_window+1)].values
-                
-                left_size = swing_high_series.iloc[i] - (max(left_values) if len(left_values) > 0 else swing_high_series.iloc[i])
-                right_size = swing_high_series.iloc[i] - (max(right_values) if len(right_values) > 0 else swing_high_series.iloc[i])
-                
-                # For minute-level data, adjust the minimum size requirement dynamically
-                # based on the ATR to catch smaller swings
-                dynamic_min_size = min(min_size, self.indicators['atr'].iloc[-1] * 0.1)
-                
-                # More lenient for recent candles
-                if is_recent:
-                    dynamic_min_size *= 0.5  # Reduce threshold by half for recent candles
-                
-                if max(left_size, right_size) >= dynamic_min_size:
-                    swing_highs.append((i, swing_high_series.iloc[i]))
-                    
-            if is_swing_low:
-                # Use a smaller window for size comparison on smaller timeframes
-                comparison_window = min(actual_lookback, 5)
-                
-                # Check size against surrounding candles
-                left_values = swing_low_series.iloc[max(0, i-comparison_window):i].values
-                right_values = swing_low_series.iloc[i+1:min(data_length, i+comparison_window+1)].values
-                
-                left_size = (min(left_values) if len(left_values) > 0 else swing_low_series.iloc[i]) - swing_low_series.iloc[i]
-                right_size = (min(right_values) if len(right_values) > 0 else swing_low_series.iloc[i]) - swing_low_series.iloc[i]
-                
-                # For minute-level data, adjust the minimum size requirement dynamically
-                dynamic_min_size = min(min_size, self.indicators['atr'].iloc[-1] * 0.1)
-                
-                # More lenient for recent candles
-                if is_recent:
-                    dynamic_min_size *= 0.5  # Reduce threshold by half for recent candles
-                
-                if max(left_size, right_size) >= dynamic_min_size:
-                    swing_lows.append((i, swing_low_series.iloc[i]))
+        # Run the candle-by-candle scan on raw arrays (numba-compiled when available)
+        high_values = swing_high_series.values.astype(np.float64)
+        low_values = swing_low_series.values.astype(np.float64)
+        high_idx, low_idx = detect_swings(high_values, low_values, actual_lookback,
+                                          float(min_size), float(current_atr))
+        swing_highs = [(i, high_values[i]) for i in high_idx.tolist()]
+        swing_lows = [(i, low_values[i]) for i in low_idx.tolist()]
                     
         # Special handling for the most recent candle
         # If the last candle is higher than several previous ones, treat it as a potential swing high
@@ -415,14 +464,14 @@ class AISlope3Strategy(BaseStrategy):
             # Check if last candle might be a swing high (higher than 2 previous candles)
             if all(last_high > swing_high_series.iloc[last_idx-i] for i in range(1, min(3, last_idx))):
                 # Check if it's noticeably higher
-                if (last_high - max(swing_high_series.iloc[last_idx-2:last_idx])) > self.indicators['atr'].iloc[-1] * 0.05:
+                if (last_high - max(swing_high_series.iloc[last_idx-2:last_idx])) > current_atr * 0.05:
                     print(f"  - Detected potential swing high in most recent candle at {last_high:.5f}")
                     swing_highs.append((last_idx, last_high))
             
             # Check if last candle might be a swing low (lower than 2 previous candles)
             if all(last_low < swing_low_series.iloc[last_idx-i] for i in range(1, min(3, last_idx))):
                 # Check if it's noticeably lower
-                if (min(swing_low_series.iloc[last_idx-2:last_idx]) - last_low) > self.indicators['atr'].iloc[-1] * 0.05:
+                if (min(swing_low_series.iloc[last_idx-2:last_idx]) - last_low) > current_atr * 0.05:
                     print(f"  - Detected potential swing low in most recent candle at {last_low:.5f}")
                     swing_lows.append((last_idx, last_low))
                     
@@ -601,22 +650,48 @@ class AISlope3Strategy(BaseStrategy):
         Evaluate if current market conditions warrant an entry based on trend alignment between
         EMAs and market structure.
         
+        The checks run cheapest-first: EMA position and market structure are tested before any
+        slope math, and the analysis block is only printed when a trade is actually possible.
+        
         Returns (signal_type, reason) or None if no entry.
         """
-        # Get latest data
-        current_price = self.data['close'].iloc[-1]
-        atr = self.indicators['atr'].iloc[-1]
-        
         # Get EMA values for trend determination
         fast_ema_period = self.config['FAST_EMA']
         slow_ema_period = self.config['SLOW_EMA']
-        fast_ema = self.indicators[f'ema{fast_ema_period}'].iloc[-1]
-        slow_ema = self.indicators[f'ema{slow_ema_period}'].iloc[-1]
+        fast_ema = self._ema_fast_arr[-1]
+        slow_ema = self._ema_slow_arr[-1]
+        
+        # === Phase 1: cheapest checks ===
+        # Calculate EMA crossover status
+        ema_bullish = fast_ema > slow_ema
+        ema_bearish = fast_ema < slow_ema
+        
+        # Get market structure info
+        trend = self.market_structure.get('trend', 'neutral')
+        higher_highs = self.market_structure.get('higher_highs', False)
+        lower_lows = self.market_structure.get('lower_lows', False)
+        short_term_direction = self.market_structure.get('short_term_direction', 'neutral')
         
+        # Compare the direction labels once; reused by the structure checks and factor sums
+        is_trend_up = trend == 'up'
+        is_trend_down = trend == 'down'
+        is_std_up = short_term_direction == 'up'
+        is_std_down = short_term_direction == 'down'
+        
+        # For market structure factors, we need at least one structural confirmation
+        market_structure_bullish = higher_highs or is_trend_up
+        market_structure_bearish = lower_lows or is_trend_down
+        
+        # EMA position and market structure must agree before the factor count can matter
+        if not (ema_bullish and market_structure_bullish) and not (ema_bearish and market_structure_bearish):
+            print("❌ No clear trend alignment - cannot determine trade direction")
+            return None
+        
+        # === Phase 2: slope and factor counting ===
         # Get some recent EMAs for slope calculation
-        if len(self.indicators[f'ema{fast_ema_period}']) > 3:
-            fast_ema_prev = self.indicators[f'ema{fast_ema_period}'].iloc[-3]
-            slow_ema_prev = self.indicators[f'ema{slow_ema_period}'].iloc[-3]
+        if len(self._ema_fast_arr) > 3:
+            fast_ema_prev = self._ema_fast_arr[-3]
+            slow_ema_prev = self._ema_slow_arr[-3]
             
             # Calculate EMA slopes (direction)
             fast_ema_slope = (fast_ema - fast_ema_prev) / fast_ema_prev * 100
@@ -627,79 +702,59 @@ class AISlope3Strategy(BaseStrategy):
             fast_ema_falling = fast_ema_slope < 0
             slow_ema_rising = slow_ema_slope > 0
             slow_ema_falling = slow_ema_slope < 0
-            
-            # Check if both EMAs are moving in the same direction
-            emas_aligned_bullish = fast_ema_rising and slow_ema_rising
-            emas_aligned_bearish = fast_ema_falling and slow_ema_falling
         else:
             # Not enough data for slope calculation
-            emas_aligned_bullish = False
-            emas_aligned_bearish = False
+            fast_ema_rising = fast_ema_falling = False
+            slow_ema_rising = slow_ema_falling = False
             fast_ema_slope = 0
             slow_ema_slope = 0
         
-        # Calculate EMA crossover status
-        ema_bullish = fast_ema > slow_ema
-        ema_bearish = fast_ema < slow_ema
-        
-        # Get market structure info
-        trend = self.market_structure.get('trend', 'neutral')
-        higher_highs = self.market_structure.get('higher_highs', False)
-        lower_lows = self.market_structure.get('lower_lows', False)
-        last_swing = self.market_structure.get('last_swing', None)
-        short_term_direction = self.market_structure.get('short_term_direction', 'neutral')
-        
-        # Print analysis details
-        print("\n📊 TREND ALIGNMENT ANALYSIS:")
-        print(f"  - Current Price: {current_price:.5f}")
-        print(f"  - EMA{fast_ema_period}: {fast_ema:.5f} (slope: {fast_ema_slope:.4f}%)")
-        print(f"  - EMA{slow_ema_period}: {slow_ema:.5f} (slope: {slow_ema_slope:.4f}%)")
-        print(f"  - EMA Position: {'BULLISH' if ema_bullish else 'BEARISH'} (Fast EMA {'above' if ema_bullish else 'below'} Slow EMA)")
-        print(f"  - EMA Direction: {'ALIGNED' if (emas_aligned_bullish or emas_aligned_bearish) else 'MIXED'} ({'rising' if emas_aligned_bullish else 'falling' if emas_aligned_bearish else 'mixed'})")
-        print(f"  - Market Structure Trend: {trend.upper()}")
-        print(f"  - Short-term Direction: {short_term_direction.upper()}")
-        print(f"  - Higher Highs: {'✅' if higher_highs else '❌'}")
-        print(f"  - Lower Lows: {'✅' if lower_lows else '❌'}")
-        
         # For less strict conditions, calculate how many factors are aligned
         bullish_factors = sum([
             ema_bullish,                  # Fast EMA above Slow EMA
             fast_ema_rising,              # Fast EMA rising
             slow_ema_rising,              # Slow EMA rising
-            trend == 'up',                # Market structure trend
+            is_trend_up,                  # Market structure trend
             higher_highs,                 # Higher highs pattern
-            short_term_direction == 'up'  # Short-term price direction
+            is_std_up                     # Short-term price direction
         ])
         
         bearish_factors = sum([
             ema_bearish,                   # Fast EMA below Slow EMA
             fast_ema_falling,              # Fast EMA falling
             slow_ema_falling,              # Slow EMA falling
-            trend == 'down',               # Market structure trend
+            is_trend_down,                 # Market structure trend
             lower_lows,                    # Lower lows pattern
-            short_term_direction == 'down' # Short-term price direction
+            is_std_down                    # Short-term price direction
         ])
         
-        print(f"  - Bullish alignment factors: {bullish_factors}/6")
-        print(f"  - Bearish alignment factors: {bearish_factors}/6")
-        
         # Determine if we can trade based on trend alignment
         # Require at least 3 out of 6 factors aligned in the same direction (lowered from 4)
         # and ensure that EMA position is correct (fast above/below slow)
-        can_go_long = bullish_factors >= 3 and ema_bullish
-        can_go_short = bearish_factors >= 3 and ema_bearish
-        
-        # For market structure factors, we need at least one structural confirmation
-        market_structure_bullish = higher_highs or trend == 'up'
-        market_structure_bearish = lower_lows or trend == 'down'
-        
-        # Add market structure requirement
-        can_go_long = can_go_long and market_structure_bullish
-        can_go_short = can_go_short and market_structure_bearish
+        can_go_long = bullish_factors >= 3 and ema_bullish and market_structure_bullish
+        can_go_short = bearish_factors >= 3 and ema_bearish and market_structure_bearish
         
         if not (can_go_long or can_go_short):
             print("❌ No clear trend alignment - cannot determine trade direction")
             return None
+        
+        # === Phase 3: verbose analysis, only when a trade fires ===
+        current_price = self._close_arr[-1]
+        emas_aligned_bullish = fast_ema_rising and slow_ema_rising
+        emas_aligned_bearish = fast_ema_falling and slow_ema_falling
+        
+        print("\n📊 TREND ALIGNMENT ANALYSIS:")
+        print(f"  - Current Price: {current_price:.5f}")
+        print(f"  - EMA{fast_ema_period}: {fast_ema:.5f} (slope: {fast_ema_slope:.4f}%)")
+        print(f"  - EMA{slow_ema_period}: {slow_ema:.5f} (slope: {slow_ema_slope:.4f}%)")
+        print(f"  - EMA Position: {'BULLISH' if ema_bullish else 'BEARISH'} (Fast EMA {'above' if ema_bullish else 'below'} Slow EMA)")
+        print(f"  - EMA Direction: {'ALIGNED' if (emas_aligned_bullish or emas_aligned_bearish) else 'MIXED'} ({'rising' if emas_aligned_bullish else 'falling' if emas_aligned_bearish else 'mixed'})")
+        print(f"  - Market Structure Trend: {trend.upper()}")
+        print(f"  - Short-term Direction: {short_term_direction.upper()}")
+        print(f"  - Higher Highs: {'✅' if higher_highs else '❌'}")
+        print(f"  - Lower Lows: {'✅' if lower_lows else '❌'}")
+        print(f"  - Bullish alignment factors: {bullish_factors}/6")
+        print(f"  - Bearish alignment factors: {bearish_factors}/6")
             
         # Log the primary trend direction
         if can_go_long:
@@ -709,6 +764,48 @@ class AISlope3Strategy(BaseStrategy):
             print(f"✅ BEARISH TREND ALIGNMENT: {bearish_factors}/6 factors aligned")
             return mt5.ORDER_TYPE_SELL, f"Bearish trend alignment ({bearish_factors}/6 factors)"
     
+    def evaluate_ema_grid(self, periods):
+        """
+        Evaluate the latest bar's entry decision for every (fast, slow) EMA pair at once.
+        Useful for EMA period sweeps; market structure is taken from the current analysis,
+        so call it after calculate_indicators. The EMAs come from _streaming_ema, like
+        the live entry path, so the configured pair gets the same decision as
+        _evaluate_entry_conditions.
+        
+        Args:
+            periods (list): Candidate EMA periods
+            
+        Returns:
+            dict: {(fast_period, slow_period): mt5.ORDER_TYPE_BUY / mt5.ORDER_TYPE_SELL / None}
+        """
+        if self.data.empty or not self.market_structure:
+            return {}
+            
+        trend = self.market_structure.get('trend', 'neutral')
+        higher_highs = self.market_structure.get('higher_highs', False)
+        lower_lows = self.market_structure.get('lower_lows', False)
+        short_term_direction = self.market_structure.get('short_term_direction', 'neutral')
+        is_trend_up = trend == 'up'
+        is_trend_down = trend == 'down'
+        
+        signals = ema_alignment_grid(
+            self.data['close'], periods,
+            structure_bullish=is_trend_up + higher_highs + (short_term_direction == 'up'),
+            structure_bearish=is_trend_down + lower_lows + (short_term_direction == 'down'),
+            ms_bullish=higher_highs or is_trend_up,
+            ms_bearish=lower_lows or is_trend_down,
+            ema_grid=np.column_stack([self._streaming_ema(period) for period in periods]),
+            last_only=True,
+        )[0]
+        
+        signal_types = {1: mt5.ORDER_TYPE_BUY, -1: mt5.ORDER_TYPE_SELL, 0: None}
+        return {
+            (fast, slow): signal_types[int(signals[i, j])]
+            for i, fast in enumerate(periods)
+            for j, slow in enumerate(periods)
+            if fast != slow
+        }
+    
     def _calculate_price_levels(self, signal_type):
         """
         Calculate entry, stop loss, and take profit prices based on
@@ -721,8 +818,8 @@ class AISlope3Strategy(BaseStrategy):
             return None
             
         # Get the latest close price and ATR
-        close_price = self.data['close'].iloc[-1]
-        atr = self.indicators['atr'].iloc[-1]
+        close_price = self._close_arr[-1]
+        atr = self._atr_arr[-1]
         
         # Get ATR multipliers from config
         sl_mult = self.config['SL_ATR_MULT']
@@ -742,106 +839,12 @@ class AISlope3Strategy(BaseStrategy):
         
         # Initialize price levels with close price
         entry = close_price
-        stop = None
-        tp = None
         
-        # STOP LOSS PLACEMENT BASED ON MARKET STRUCTURE
+        # LONG: stop below swing lows, target swing highs. SHORT mirrors this with the sign flipped.
         if signal_type == mt5.ORDER_TYPE_BUY:
-            # For a LONG position:
-            # 1. Primary SL: Below the most recent swing low
-            # 2. Backup SL: ATR-based if no suitable swing low
-            
-            # Find the most recent swing low below current price
-            valid_sl_points = [(i, price) for i, price in swing_lows if price < close_price]
-            
-            if valid_sl_points:
-                # Get the most recent one
-                recent_low_idx, recent_low_price = valid_sl_points[0]
-                distance_in_candles = len(self.data) - 1 - recent_low_idx
-                
-                # Use this swing low if it's reasonably recent (within 20 candles)
-                if distance_in_candles <= 20:
-                    # Place stop just below the swing low with a buffer
-                    stop = recent_low_price - (0.1 * atr)
-                    print(f"  - Using swing low at {recent_low_price:.5f} ({distance_in_candles} candles ago) for stop placement")
-            
-            # If no suitable swing low found or stop is too far, use ATR-based stop
-            if stop is None or (close_price - stop) > sl_mult * atr * 3:
-                stop = close_price - sl_mult * atr
-                print(f"  - Using ATR-based stop: {sl_mult}x ATR below entry")
-                
-            # TAKE PROFIT PLACEMENT - Either:
-            # 1. Target the next swing high above current price
-            # 2. Use ATR multiple if no suitable target
-            
-            valid_tp_points = [(i, price) for i, price in swing_highs if price > close_price]
-            
-            if valid_tp_points:
-                # Get the nearest swing high above current price
-                next_high_idx, next_high_price = valid_tp_points[0]
-                
-                # Use this swing high as TP target with a buffer
-                tp = next_high_price - (0.1 * atr)
-                print(f"  - Using next swing high at {next_high_price:.5f} for take profit")
-            
-            # If no suitable swing high found or TP gives poor R:R, use ATR-based TP
-            # Calculate risk
-            risk = close_price - stop
-            
-            # If no TP set yet or TP gives poor R:R, use ATR-based TP
-            if tp is None or (tp - close_price) < risk * 1.5:
-                # Aim for at least 1.5:1 reward-to-risk ratio, with minimum of tp_mult * ATR
-                tp_distance = max(risk * 1.5, tp_mult * atr)
-                tp = close_price + tp_distance
-                print(f"  - Using ATR-based take profit: {tp_mult}x ATR above entry")
-            
+            stop, tp = self._compute_levels(1, close_price, atr, sl_mult, tp_mult, swing_lows, swing_highs)
         else:  # SELL order
-            # For a SHORT position:
-            # 1. Primary SL: Above the most recent swing high
-            # 2. Backup SL: ATR-based if no suitable swing high
-            
-            # Find the most recent swing high above current price
-            valid_sl_points = [(i, price) for i, price in swing_highs if price > close_price]
-            
-            if valid_sl_points:
-                # Get the most recent one
-                recent_high_idx, recent_high_price = valid_sl_points[0]
-                distance_in_candles = len(self.data) - 1 - recent_high_idx
-                
-                # Use this swing high if it's reasonably recent (within 20 candles)
-                if distance_in_candles <= 20:
-                    # Place stop just above the swing high with a buffer
-                    stop = recent_high_price + (0.1 * atr)
-                    print(f"  - Using swing high at {recent_high_price:.5f} ({distance_in_candles} candles ago) for stop placement")
-            
-            # If no suitable swing high found or stop is too far, use ATR-based stop
-            if stop is None or (stop - close_price) > sl_mult * atr * 3:
-                stop = close_price + sl_mult * atr
-                print(f"  - Using ATR-based stop: {sl_mult}x ATR above entry")
-                
-            # TAKE PROFIT PLACEMENT - Either:
-            # 1. Target the next swing low below current price
-            # 2. Use ATR multiple if no suitable target
-            
-            valid_tp_points = [(i, price) for i, price in swing_lows if price < close_price]
-            
-            if valid_tp_points:
-                # Get the nearest swing low below current price
-                next_low_idx, next_low_price = valid_tp_points[0]
-                
-                # Use this swing low as TP target with a buffer
-                tp = next_low_price + (0.1 * atr)
-                print(f"  - Using next swing low at {next_low_price:.5f} for take profit")
-            
-            # Calculate risk
-            risk = stop - close_price
-            
-            # If no TP set yet or TP gives poor R:R, use ATR-based TP
-            if tp is None or (close_price - tp) < risk * 1.5:
-                # Aim for at least 1.5:1 reward-to-risk ratio, with minimum of tp_mult * ATR
-                tp_distance = max(risk * 1.5, tp_mult * atr)
-                tp = close_price - tp_distance
-                print(f"  - Using ATR-based take profit: {tp_mult}x ATR below entry")
+            stop, tp = self._compute_levels(-1, close_price, atr, sl_mult, tp_mult, swing_highs, swing_lows)
             
         # Store calculated levels
         self.price_levels = {
@@ -864,6 +867,73 @@ class AISlope3Strategy(BaseStrategy):
         
         return self.price_levels
     
+    def _compute_levels(self, side, close, atr, sl_mult, tp_mult, swing_against, swing_with):
+        """
+        Compute stop loss and take profit for one trade direction.
+        
+        Args:
+            side: +1 for a LONG position, -1 for a SHORT position
+            close: Latest close price (entry)
+            atr: Latest ATR value
+            sl_mult: Stop loss ATR multiplier
+            tp_mult: Take profit ATR multiplier
+            swing_against: Swing points on the stop side (lows for LONG, highs for SHORT), most recent first
+            swing_with: Swing points on the target side (highs for LONG, lows for SHORT), most recent first
+            
+        Returns:
+            tuple: (stop, tp)
+        """
+        against_name, with_name = ('low', 'high') if side > 0 else ('high', 'low')
+        stop_side, tp_side = ('below', 'above') if side > 0 else ('above', 'below')
+        stop = None
+        tp = None
+        
+        # STOP LOSS PLACEMENT BASED ON MARKET STRUCTURE
+        # 1. Primary SL: Beyond the most recent swing point on the stop side of price
+        # 2. Backup SL: ATR-based if no suitable swing point
+        valid_sl_points = [(i, price) for i, price in swing_against if side * (close - price) > 0]
+        
+        if valid_sl_points:
+            # Get the most recent one
+            recent_idx, recent_price = valid_sl_points[0]
+            distance_in_candles = len(self.data) - 1 - recent_idx
+            
+            # Use this swing point if it's reasonably recent (within 20 candles)
+            if distance_in_candles <= 20:
+                # Place stop just beyond the swing point with a buffer
+                stop = recent_price - side * (0.1 * atr)
+                print(f"  - Using swing {against_name} at {recent_price:.5f} ({distance_in_candles} candles ago) for stop placement")
+        
+        # If no suitable swing point found or stop is too far, use ATR-based stop
+        if stop is None or side * (close - stop) > sl_mult * atr * 3:
+            stop = close - side * sl_mult * atr
+            print(f"  - Using ATR-based stop: {sl_mult}x ATR {stop_side} entry")
+            
+        # TAKE PROFIT PLACEMENT - Either:
+        # 1. Target the next swing point on the profit side of price
+        # 2. Use ATR multiple if no suitable target
+        valid_tp_points = [(i, price) for i, price in swing_with if side * (price - close) > 0]
+        
+        if valid_tp_points:
+            # Get the nearest swing point beyond current price
+            next_idx, next_price = valid_tp_points[0]
+            
+            # Use this swing point as TP target with a buffer
+            tp = next_price - side * (0.1 * atr)
+            print(f"  - Using next swing {with_name} at {next_price:.5f} for take profit")
+        
+        # Calculate risk
+        risk = side * (close - stop)
+        
+        # If no TP set yet or TP gives poor R:R, use ATR-based TP
+        if tp is None or side * (tp - close) < risk * 1.5:
+            # Aim for at least 1.5:1 reward-to-risk ratio, with minimum of tp_mult * ATR
+            tp_distance = max(risk * 1.5, tp_mult * atr)
+            tp = close + side * tp_distance
+            print(f"  - Using ATR-based take profit: {tp_mult}x ATR {tp_side} entry")
+            
+        return stop, tp
+    
     def generate_exit_signal(self, position):
         """
         Generates exit signals based on trend alignment changes.
@@ -882,14 +952,12 @@ class AISlope3Strategy(BaseStrategy):
             return False
         
         # Get EMA values for trend determination
-        fast_ema_period = self.config['FAST_EMA']
-        slow_ema_period = self.config['SLOW_EMA']
-        fast_ema = self.indicators[f'ema{fast_ema_period}'].iloc[-1]
-        slow_ema = self.indicators[f'ema{slow_ema_period}'].iloc[-1]
+        fast_ema = self._ema_fast_arr[-1]
+        slow_ema = self._ema_slow_arr[-1]
         
         # Get previous EMA values for slope calculation
-        if len(self.indicators[f'ema{fast_ema_period}']) > 3:
-            fast_ema_prev = self.indicators[f'ema{fast_ema_period}'].iloc[-3]
+        if len(self._ema_fast_arr) > 3:
+            fast_ema_prev = self._ema_fast_arr[-3]
             fast_ema_slope = (fast_ema - fast_ema_prev) / fast_ema_prev * 100
         else:
             fast_ema_slope = 0
@@ -903,19 +971,19 @@ class AISlope3Strategy(BaseStrategy):
         ema_bearish = fast_ema < slow_ema
         
         # Get current price and position details
-        current_price = self.data['close'].iloc[-1]
+        current_price = self._close_arr[-1]
         entry_price = position.price_open
         is_long = position.type == mt5.POSITION_TYPE_BUY
         is_short = position.type == mt5.POSITION_TYPE_SELL
         
-        # Calculate position profit
-        profit_in_points = 0
-        profit_percent = 0
+        # Calculate position profit once; the emergency exit below reuses the same ratio
+        inv_entry = 1.0 / entry_price
+        price_move = current_price - entry_price
+        delta_long_pct = price_move * inv_entry * 100.0
+        profit_in_points = price_move if is_long else -price_move
+        profit_percent = delta_long_pct if is_long else -delta_long_pct
         
         if is_long:
-            profit_in_points = current_price - entry_price
-            profit_percent = (profit_in_points / entry_price) * 100
-            
             # Exit scenarios for LONG positions:
             # 1. EMA crossover (fast EMA crosses below slow EMA)
             if ema_bearish:
@@ -933,9 +1001,6 @@ class AISlope3Strategy(BaseStrategy):
                 return True
             
         elif is_short:
-            profit_in_points = entry_price - current_price
-            profit_percent = (profit_in_points / entry_price) * 100
-            
             # Exit scenarios for SHORT positions:
             # 1. EMA crossover (fast EMA crosses above slow EMA)
             if ema_bullish:
@@ -975,11 +1040,11 @@ class AISlope3Strategy(BaseStrategy):
                 return True
             
         # Emergency exit if position has significant loss (SL didn't trigger for some reason)
-        if is_long and ((entry_price - current_price) / entry_price * 100) > 5.0:
+        if is_long and delta_long_pct < -5.0:
             print(f"🚨 EMERGENCY EXIT (LONG): Price dropped more than 5% from entry")
             return True
             
-        if is_short and ((current_price - entry_price) / entry_price * 100) > 5.0:
+        if is_short and delta_long_pct > 5.0:
             print(f"🚨 EMERGENCY EXIT (SHORT): Price rose more than 5% from entry")
             return True
         
@@ -995,5 +1060,8 @@ class AISlope3Strategy(BaseStrategy):
         # Reset candle counter
         self.candles_since_exit = 0
         
+        # Force a full EMA recompute on the next update
+        self._ema_states = {}
+        
         # Call the parent class method to reset other state
         super().reset_signal_state() 
\ No newline at end of file
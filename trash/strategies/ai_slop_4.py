@@ -1,16 +1,25 @@
 import MetaTrader5 as mt5
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from strategies.base_strategy import BaseStrategy
+from strategies._adx_njit import adx_fold, adx_step, adx_wilder, new_adx_state
+try:
+    from bottleneck import move_max, move_min
+except ImportError:
+    move_max = move_min = None
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from collections import deque
+import functools
 import math
+from types import MappingProxyType
 
 # Add parent directory to path to import needed functions
 sys.path.append('..')
 try:
-    from generic_trader import get_candle_boundaries, get_server_time
+    from generic_trader import get_candle_boundaries, get_server_time, get_timeframe_minutes
 except ImportError:
     raise ImportError("Could not import required functions from generic_trader.py")
 
@@ -36,6 +45,68 @@ ADX_BREAKOUT_CONFIG = {
     'VERBOSE_LOGGING': False,      # Enable detailed logging
 }
 
+# Capacity of the price buffers, in data windows (see AISlope4Strategy._sync_price_buffers)
+_BUFFER_WINDOWS = 2
+
+# Human-readable timeframe names for the configuration printout
+_TIMEFRAME_NAMES = MappingProxyType({
+    mt5.TIMEFRAME_M1: "1 minute",
+    mt5.TIMEFRAME_M5: "5 minutes",
+    mt5.TIMEFRAME_M15: "15 minutes",
+    mt5.TIMEFRAME_M30: "30 minutes",
+    mt5.TIMEFRAME_H1: "1 hour",
+    mt5.TIMEFRAME_H4: "4 hours",
+    mt5.TIMEFRAME_D1: "1 day",
+    mt5.TIMEFRAME_W1: "1 week",
+    mt5.TIMEFRAME_MN1: "1 month"
+})
+
+# Candle length in minutes for the timeframes the data check can verify
+_TIMEFRAME_MINUTES = MappingProxyType({
+    mt5.TIMEFRAME_M1: 1,
+    mt5.TIMEFRAME_M5: 5,
+    mt5.TIMEFRAME_M15: 15,
+    mt5.TIMEFRAME_M30: 30,
+    mt5.TIMEFRAME_H1: 60,
+    mt5.TIMEFRAME_H4: 240,
+    mt5.TIMEFRAME_D1: 1440,
+})
+
+# Candle length in seconds as used for candle boundaries (get_timeframe_minutes
+# rebuilds its map on every call, so resolve it once per timeframe)
+_TIMEFRAME_SECONDS = MappingProxyType({tf: get_timeframe_minutes(tf) * 60 for tf in _TIMEFRAME_NAMES})
+
+
+def _timeframe_seconds(timeframe):
+    """Candle length in seconds, matching get_candle_boundaries"""
+    seconds = _TIMEFRAME_SECONDS.get(timeframe)
+    return seconds if seconds is not None else get_timeframe_minutes(timeframe) * 60
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_boundaries(bucket, timeframe):
+    """Candle boundaries of candle number `bucket` (epoch seconds // candle length)"""
+    candle_start = datetime.fromtimestamp(bucket * _timeframe_seconds(timeframe), tz=timezone.utc)
+    return get_candle_boundaries(candle_start, timeframe)
+
+
+def _candle_boundaries(timestamp, timeframe):
+    """
+    get_candle_boundaries, memoized per candle: every tick within a candle maps to
+    the same bucket, so only the first one does the datetime arithmetic.
+    
+    Args:
+        timestamp (datetime): Time inside the candle (naive times are taken as UTC)
+        timeframe: MT5 timeframe constant
+        
+    Returns:
+        tuple: (candle_start, candle_end) as UTC datetimes
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    bucket = int(timestamp.timestamp()) // _timeframe_seconds(timeframe)
+    return _cached_boundaries(bucket, timeframe)
+
 class AISlope4Strategy(BaseStrategy):
     """
     Rob Booker ADX Breakout Strategy
@@ -77,6 +148,18 @@ class AISlope4Strategy(BaseStrategy):
         # Merge provided config with default config
         self.config = {**ADX_BREAKOUT_CONFIG, **(strategy_config or {})}
         
+        # Config values used on every tick, as typed attributes (self.adx_period, ...)
+        self._resolve_config({
+            'VERBOSE_LOGGING': (bool, ADX_BREAKOUT_CONFIG['VERBOSE_LOGGING']),
+            'ADX_PERIOD': (int, ADX_BREAKOUT_CONFIG['ADX_PERIOD']),
+            'ADX_SMOOTH_PERIOD': (int, ADX_BREAKOUT_CONFIG['ADX_SMOOTH_PERIOD']),
+            'ADX_LOWER_LEVEL': (float, ADX_BREAKOUT_CONFIG['ADX_LOWER_LEVEL']),
+            'BOX_LOOKBACK': (int, ADX_BREAKOUT_CONFIG['BOX_LOOKBACK']),
+            'ENABLE_DIRECTION': (int, ADX_BREAKOUT_CONFIG['ENABLE_DIRECTION']),
+            'STOP_LOSS_MULTIPLE': (float, ADX_BREAKOUT_CONFIG['STOP_LOSS_MULTIPLE']),
+            'PROFIT_TARGET_MULTIPLE': (float, ADX_BREAKOUT_CONFIG['PROFIT_TARGET_MULTIPLE']),
+        })
+        
         # Strategy state variables
         self.data = pd.DataFrame()
         self.indicators = {}
@@ -98,44 +181,58 @@ class AISlope4Strategy(BaseStrategy):
         self.pending_buy_signal = False
         self.pending_sell_signal = False
         
+        # Streaming ADX state as of the last closed bar (see _adx_njit.py)
+        self._adx_state = None
+        self._adx_state_time = None
+        
+        # Rolling box window over closed bars: monotonic deques of (bar number, price)
+        self._hi_deque = deque()
+        self._lo_deque = deque()
+        self._box_bar_count = 0
+        
+        # Forming bar and position state the indicators were last calculated for,
+        # and the latest values they produced
+        self._last_indicator_key = None
+        self._last_adx = None
+        self._last_close = None
+        self._prev_close = None
+        
+        # Price buffers (rows: high, low, close) and the views of the current window
+        # into them, synced in update_data (see _sync_price_buffers)
+        self._price_buffer = np.empty((3, 0))
+        self._buffer_head = 0
+        self._buffer_last_time = None
+        self._high = self._price_buffer[0]
+        self._low = self._price_buffer[1]
+        self._close = self._price_buffer[2]
+        
         # Print strategy configuration
         self._print_config()
     
     def _print_config(self):
         """Print the current strategy configuration"""
         # Map MT5 timeframe to human-readable string
-        timeframe_names = {
-            mt5.TIMEFRAME_M1: "1 minute",
-            mt5.TIMEFRAME_M5: "5 minutes",
-            mt5.TIMEFRAME_M15: "15 minutes",
-            mt5.TIMEFRAME_M30: "30 minutes",
-            mt5.TIMEFRAME_H1: "1 hour",
-            mt5.TIMEFRAME_H4: "4 hours",
-            mt5.TIMEFRAME_D1: "1 day",
-            mt5.TIMEFRAME_W1: "1 week",
-            mt5.TIMEFRAME_MN1: "1 month"
-        }
-        timeframe_name = timeframe_names.get(self.timeframe, f"Unknown ({self.timeframe})")
+        timeframe_name = _TIMEFRAME_NAMES.get(self.timeframe, f"Unknown ({self.timeframe})")
         
         print("\n=== ADX BREAKOUT STRATEGY CONFIGURATION ===")
         print(f"Symbol: {self.symbol}")
         print(f"Timeframe: {timeframe_name}")
-        print(f"ADX Smooth Period: {self.config['ADX_SMOOTH_PERIOD']}")
-        print(f"ADX Period: {self.config['ADX_PERIOD']}")
-        print(f"ADX Lower Level: {self.config['ADX_LOWER_LEVEL']}")
-        print(f"Box Lookback: {self.config['BOX_LOOKBACK']}")
-        print(f"Profit Target Multiple: {self.config['PROFIT_TARGET_MULTIPLE']}")
-        print(f"Stop Loss Multiple: {self.config['STOP_LOSS_MULTIPLE']}")
+        print(f"ADX Smooth Period: {self.adx_smooth_period}")
+        print(f"ADX Period: {self.adx_period}")
+        print(f"ADX Lower Level: {self.adx_lower_level:g}")
+        print(f"Box Lookback: {self.box_lookback}")
+        print(f"Profit Target Multiple: {self.profit_target_multiple}")
+        print(f"Stop Loss Multiple: {self.stop_loss_multiple}")
         direction_map = {0: "Both", 1: "Long Only", -1: "Short Only"}
-        print(f"Direction: {direction_map[self.config['ENABLE_DIRECTION']]}")
+        print(f"Direction: {direction_map[self.enable_direction]}")
         print("===========================================\n")
     
     def get_required_data_count(self):
         """Return the minimum number of candles needed for this strategy"""
         # We need enough data for ADX calculation plus our box lookback
-        adx_period = self.config['ADX_PERIOD']
-        adx_smooth = self.config['ADX_SMOOTH_PERIOD']
-        box_lookback = self.config['BOX_LOOKBACK']
+        adx_period = self.adx_period
+        adx_smooth = self.adx_smooth_period
+        box_lookback = self.box_lookback
         
         # Calculate minimum required bars
         required_bars = max(100, int(adx_period + adx_smooth + box_lookback + 20))
@@ -167,12 +264,13 @@ class AISlope4Strategy(BaseStrategy):
             self.position_type = "LONG" if pos_type == mt5.POSITION_TYPE_BUY else "SHORT"
             
             # Store average position price
-            total_volume = sum(pos.volume for pos in open_positions)
-            weighted_price = sum(pos.price_open * pos.volume for pos in open_positions) / total_volume
-            self.position_price = weighted_price
+            count = len(open_positions)
+            prices = np.fromiter((pos.price_open for pos in open_positions), dtype=np.float64, count=count)
+            volumes = np.fromiter((pos.volume for pos in open_positions), dtype=np.float64, count=count)
+            self.position_price = float(prices @ volumes / volumes.sum())
             
             # Log only if state changed or verbose logging enabled
-            if not previous_status or self.config['VERBOSE_LOGGING']:
+            if not previous_status or self.verbose_logging:
                 print(f"🔹 Position status: IN POSITION ({self.position_type}) - {len(open_positions)} positions")
                 print(f"🔹 Average entry price: {self.position_price:.2f}")
         else:
@@ -183,76 +281,114 @@ class AISlope4Strategy(BaseStrategy):
             self.position_type = None
             
             # Log only if state changed or verbose logging enabled
-            if previous_status or self.config['VERBOSE_LOGGING']:
+            if previous_status or self.verbose_logging:
                 print(f"🔹 Position status: NO OPEN POSITIONS")
                 
         # Return whether status changed
         return previous_status != self.in_position
         
+    def _push_box_bar(self, high, low, lookback):
+        """
+        Add a closed bar to the rolling box window.
+        
+        Both deques stay monotonic (highs decreasing, lows increasing), so their
+        fronts are the highest high and lowest low of the last `lookback` closed
+        bars; each bar is appended and popped at most once.
+        
+        Args:
+            high (float): Bar high
+            low (float): Bar low
+            lookback (int): Number of closed bars in the box window
+        """
+        bar = self._box_bar_count
+        highs, lows = self._hi_deque, self._lo_deque
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((bar, high))
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((bar, low))
+        
+        # Drop bars that have left the window
+        oldest = bar - lookback
+        while highs[0][0] <= oldest:
+            highs.popleft()
+        while lows[0][0] <= oldest:
+            lows.popleft()
+        self._box_bar_count = bar + 1
+        
     def calculate_indicators(self):
         """
         Calculate ADX indicator values and box levels based on the latest data.
         Implementation is simplified for maximum reliability.
         """
-        if self.data.empty or len(self.data) < (self.config['ADX_PERIOD'] + self.config['ADX_SMOOTH_PERIOD']):
+        if self.data.empty or len(self.data) < (self.adx_period + self.adx_smooth_period):
+            return
+        
+        # Ticks that leave the forming bar (and the position state) unchanged would
+        # produce exactly the same ADX, box levels and crosses - skip them
+        indicator_key = (self.data.index[-1], self._high[-1], self._low[-1], self._close[-1], self.in_position)
+        if indicator_key == self._last_indicator_key:
             return
+        self._last_indicator_key = indicator_key
             
         # Get parameters from config
-        adx_smooth_period = self.config['ADX_SMOOTH_PERIOD']
-        adx_period = self.config['ADX_PERIOD']
-        adx_lower_level = self.config['ADX_LOWER_LEVEL']
-        box_lookback = self.config['BOX_LOOKBACK']
+        adx_smooth_period = self.adx_smooth_period
+        adx_period = self.adx_period
+        adx_lower_level = self.adx_lower_level
+        box_lookback = self.box_lookback
         
         # Get current server time for logging
         server_time = get_server_time()
         
-        # === Calculate ADX using TA-Lib equivalent methods ===
-        # Calculate True Range
-        high = self.data['high']
-        low = self.data['low']
-        close = self.data['close']
-        
-        # True Range is max of (high-low, abs(high-prev_close), abs(low-prev_close))
-        prev_close = close.shift(1).fillna(close)
-        tr = pd.DataFrame({
-            'hl': high - low,
-            'hpc': (high - prev_close).abs(),
-            'lpc': (low - prev_close).abs()
-        }).max(axis=1)
-        
-        # Simple RMA/EMA implementation with alpha=1/period
-        def rma(series, period):
-            return series.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-        
-        # Directional Movement
-        pos_dm = high.diff().clip(lower=0)
-        neg_dm = low.diff().multiply(-1).clip(lower=0)
-        
-        # Where pos_dm > neg_dm and pos_dm > 0, else 0
-        pos_dm = pd.Series(np.where((pos_dm > neg_dm) & (pos_dm > 0), pos_dm, 0), index=pos_dm.index)
-        # Where neg_dm > pos_dm and neg_dm > 0, else 0
-        neg_dm = pd.Series(np.where((neg_dm > pos_dm) & (neg_dm > 0), neg_dm, 0), index=neg_dm.index)
-        
-        # Smoothed values
-        smoothed_tr = rma(tr, adx_period)
-        smoothed_pos_dm = rma(pos_dm, adx_period)
-        smoothed_neg_dm = rma(neg_dm, adx_period)
-        
-        # DI+ and DI-
-        di_plus = 100 * smoothed_pos_dm / smoothed_tr
-        di_minus = 100 * smoothed_neg_dm / smoothed_tr
-        
-        # DX and ADX
-        dx = 100 * (di_plus - di_minus).abs() / (di_plus + di_minus)
-        adx = rma(dx, adx_smooth_period)
-        
-        # Store ADX, DI+, DI- in indicators dictionary
+        # === Calculate ADX (Wilder smoothing via ewm(alpha=1/period, adjust=False)) ===
+        high = self._high
+        low = self._low
+        close = self._close
+        
+        # Closed bars are folded into the streaming state once. Continue from the last
+        # folded bar when it is still in the window; otherwise (first call, or a gap
+        # in the data) rebuild the state from the whole window.
+        index = self.data.index
+        start = 0
+        state = self._adx_state
+        if state is not None:
+            pos = index.searchsorted(self._adx_state_time)
+            if pos < len(index) - 1 and index[pos] == self._adx_state_time:
+                start = pos + 1
+            else:
+                state = None
+        if state is None:
+            state = new_adx_state()
+            self._hi_deque.clear()
+            self._lo_deque.clear()
+            self._box_bar_count = 0
+        last = len(index) - 1
+        adx_fold(state, high[start:last], low[start:last], close[start:last], adx_period, adx_smooth_period)
+        
+        # Only the last box_lookback closed bars can still be in the box window
+        box_start = max(start, last - box_lookback)
+        self._box_bar_count += box_start - start
+        for i in range(box_start, last):
+            self._push_box_bar(float(high[i]), float(low[i]), box_lookback)
+        self._adx_state = state
+        self._adx_state_time = index[-2]
+        
+        # The current bar is still forming: evaluate it on a copy of the state
+        adx, di_plus, di_minus = adx_step(
+            state.copy(), high[-1], low[-1], close[-1], adx_period, adx_smooth_period)
+        
+        # Store latest ADX, DI+, DI- in indicators dictionary
         self.indicators['adx'] = adx
         self.indicators['di_plus'] = di_plus
         self.indicators['di_minus'] = di_minus
         
+        # Latest scalars for generate_entry_signal
+        self._last_adx = current_adx = float(adx)
+        self._last_close = float(close[-1])
+        self._prev_close = float(close[-2])
+        
         # Check if ADX is below the lower level (consolidation)
-        current_adx = self.indicators['adx'].iloc[-1]
         self.is_adx_low = current_adx < adx_lower_level
         
         # === TradingView Box Level Calculation ===
@@ -260,61 +396,43 @@ class AISlope4Strategy(BaseStrategy):
         # Only update box levels when not in a position, otherwise keep previous values
         if not self.in_position:
             # Log position status for clarity
-            if self.config['VERBOSE_LOGGING']:
+            if self.verbose_logging:
                 print(f"🔹 No open positions - calculating box levels")
                 
             old_upper = self.box_upper_level
             old_lower = self.box_lower_level
             
-            if len(self.data) > box_lookback:
-                # [1] in PineScript refers to the previous bar (offset by 1)
-                # highest(high, boxLookBack)[1] means:
-                #   1. Take the highest high over the lookback period
-                #   2. Then get the value from the previous bar
+            # [1] in PineScript refers to the previous bar (offset by 1), so
+            # highest(high, boxLookBack)[1] is the highest high of the `box_lookback`
+            # bars ending at the previous bar - the closed bars in the rolling window
+            if self._box_bar_count >= box_lookback:
+                self.box_upper_level = self._hi_deque[0][1]
+                self.box_lower_level = self._lo_deque[0][1]
+                self.box_width = self.box_upper_level - self.box_lower_level
+                
+                # Add extra debug for box calculation
+                if self.verbose_logging:
+                    print(f"\nBox calculation details:")
+                    print(f"Closed bars in window: {box_lookback}, ending at the previous bar")
+                    print(f"Highest high: {self.box_upper_level}")
+                    print(f"Lowest low: {self.box_lower_level}")
                 
-                # First, get the range of bars for the lookback excluding the current bar
-                # We need (lookback+1) bars: 1 for the [1] offset, and lookback for the range
-                if len(self.data) >= (box_lookback + 1):
-                    # Get lookback range ending at the previous bar (not including current)
-                    prev_bar_idx = -2  # Index of the previous bar (-1 is current, -2 is previous)
-                    lookback_start_idx = prev_bar_idx - box_lookback + 1
-                    
-                    # Get the slice of data for the lookback period
-                    lookback_highs = self.data['high'].iloc[lookback_start_idx:prev_bar_idx+1]
-                    lookback_lows = self.data['low'].iloc[lookback_start_idx:prev_bar_idx+1]
-                    
-                    # Calculate highest high and lowest low in this range
-                    if not lookback_highs.empty and not lookback_lows.empty:
-                        self.box_upper_level = lookback_highs.max()
-                        self.box_lower_level = lookback_lows.min()
-                        self.box_width = self.box_upper_level - self.box_lower_level
-                        
-                        # Add extra debug for box calculation
-                        if self.config['VERBOSE_LOGGING']:
-                            print(f"\nBox calculation details:")
-                            print(f"Current bar index: -1, Previous bar index: -2")
-                            print(f"Lookback range: {lookback_start_idx} to {prev_bar_idx}")
-                            print(f"Lookback period high values: {list(lookback_highs)}")
-                            print(f"Lookback period low values: {list(lookback_lows)}")
-                            print(f"Highest high: {self.box_upper_level}")
-                            print(f"Lowest low: {self.box_lower_level}")
-                    
-                    # Log box level changes if there's a significant change
-                    if old_upper != self.box_upper_level or old_lower != self.box_lower_level:
-                        if self.config['VERBOSE_LOGGING']:
-                            print(f"Box updated: Upper={self.box_upper_level:.2f}, Lower={self.box_lower_level:.2f}")
+                # Log box level changes if there's a significant change
+                if old_upper != self.box_upper_level or old_lower != self.box_lower_level:
+                    if self.verbose_logging:
+                        print(f"Box updated: Upper={self.box_upper_level:.2f}, Lower={self.box_lower_level:.2f}")
         else:
             # In position - maintain current box levels (don't update)
-            if self.config['VERBOSE_LOGGING']:
+            if self.verbose_logging:
                 print(f"🔹 In {self.position_type} position - keeping existing box levels")
         
-        # Always print the essential information
-        current_close = close.iloc[-1] if not close.empty else None
-        if current_close is not None and self.box_upper_level is not None:
+        # Per-tick cross and status lines are diagnostics: only format them when verbose
+        if self.verbose_logging and self.box_upper_level is not None:
             # Check for crosses - EXACTLY like TradingView's cross() function
-            prev_close = close.iloc[-2] if len(close) > 1 else current_close
-            cross_above_upper = current_close > self.box_upper_level and prev_close <= self.box_upper_level
-            cross_below_lower = current_close < self.box_lower_level and prev_close >= self.box_lower_level
+            current_close = self._last_close
+            prev_close = self._prev_close
+            cross_above_upper = bool((current_close > self.box_upper_level) & (prev_close <= self.box_upper_level))
+            cross_below_lower = bool((current_close < self.box_lower_level) & (prev_close >= self.box_lower_level))
             
             # Only print crosses
             if cross_above_upper:
@@ -328,53 +446,87 @@ class AISlope4Strategy(BaseStrategy):
                 else:
                     print(f"📉 CROSS DOWN: {current_close:.2f} crossed below box lower {self.box_lower_level:.2f} - ADX HIGH, No Trade")
         
-        # Print minimal but essential info
-        adx_status = "LOW ✓" if self.is_adx_low else "HIGH ✗"
-        position_status = f"IN {self.position_type}" if self.in_position else "NO POSITION"
-        print(f"Upper={self.box_upper_level:.2f}, Lower={self.box_lower_level:.2f} | ADX={current_adx:.2f}/{adx_lower_level} ({adx_status}) | {position_status}")
+            # Print minimal but essential info
+            adx_status = "LOW ✓" if self.is_adx_low else "HIGH ✗"
+            position_status = f"IN {self.position_type}" if self.in_position else "NO POSITION"
+            print(f"Upper={self.box_upper_level:.2f}, Lower={self.box_lower_level:.2f} | ADX={current_adx:.2f}/{adx_lower_level:g} ({adx_status}) | {position_status}")
     
     def update_data(self, new_data):
         """Updates the strategy's data and recalculates indicators"""
         if new_data is not None and not new_data.empty:
-            self.data = new_data.copy()
+            # The trader fetches a fresh DataFrame every tick and the strategy never
+            # writes to it, so it is kept as is rather than copied
+            self.data = new_data
+            self._sync_price_buffers()
             
             # Verify the data timeframe matches what's expected
-            if len(self.data) > 2 and self.config['VERBOSE_LOGGING']:
+            if len(self.data) > 2 and self.verbose_logging:
                 self._verify_data_timeframe()
                 
             # Calculate indicators with the latest data
             self.calculate_indicators()
     
+    def _sync_price_buffers(self):
+        """
+        Bring the high/low/close buffers in line with self.data, copying only the
+        rows that changed since the last update: the bar that was forming and any
+        bars after it.
+        
+        The window is kept contiguous at buffer[:, head - n:head] with spare capacity
+        after it. When the spare capacity runs out the window is moved back to the
+        front, so each bar is copied a constant number of times on average. The
+        _high/_low/_close views are owned and writable, as the numba kernels require.
+        """
+        n = len(self.data)
+        index = self.data.index
+        buffer = self._price_buffer
+        head = self._buffer_head
+        
+        # Continue from the last buffered bar if it is still in the window and every
+        # bar before it is buffered too; otherwise reload the whole window
+        start = 0
+        if self._buffer_last_time is not None:
+            pos = index.searchsorted(self._buffer_last_time)
+            if pos < n and index[pos] == self._buffer_last_time and pos < head:
+                start = pos
+        write_at = head - 1 if start else 0
+        
+        if write_at + n - start > buffer.shape[1]:
+            if buffer.shape[1] < _BUFFER_WINDOWS * n:
+                grown = np.empty((3, _BUFFER_WINDOWS * n))
+                grown[:, :start] = buffer[:, write_at - start:write_at]
+                buffer = self._price_buffer = grown
+            else:
+                buffer[:, :start] = buffer[:, write_at - start:write_at]
+            write_at = start
+        
+        head = write_at + n - start
+        buffer[0, write_at:head] = self.data['high'].to_numpy()[start:]
+        buffer[1, write_at:head] = self.data['low'].to_numpy()[start:]
+        buffer[2, write_at:head] = self.data['close'].to_numpy()[start:]
+        self._buffer_head = head
+        self._buffer_last_time = index[-1]
+        
+        self._high = buffer[0, head - n:head]
+        self._low = buffer[1, head - n:head]
+        self._close = buffer[2, head - n:head]
+    
     def _verify_data_timeframe(self):
         """Verify that the data timeframe matches the expected timeframe"""
         try:
             # Get the expected timeframe in minutes
-            timeframe_names = {
-                mt5.TIMEFRAME_M1: 1,
-                mt5.TIMEFRAME_M5: 5,
-                mt5.TIMEFRAME_M15: 15,
-                mt5.TIMEFRAME_M30: 30,
-                mt5.TIMEFRAME_H1: 60,
-                mt5.TIMEFRAME_H4: 240,
-                mt5.TIMEFRAME_D1: 1440,
-            }
-            expected_minutes = timeframe_names.get(self.timeframe, 0)
+            expected_minutes = _TIMEFRAME_MINUTES.get(self.timeframe, 0)
             
             if expected_minutes == 0:
                 return  # Unknown timeframe, can't verify
             
-            # Calculate the average time difference between candles (in minutes)
-            time_diffs = []
-            for i in range(1, min(10, len(self.data))):
-                # Calculate difference in minutes
-                current = self.data.index[-i]
-                previous = self.data.index[-i-1]
-                diff_minutes = (current - previous).total_seconds() / 60
-                time_diffs.append(diff_minutes)
+            # Calculate the average time difference between the last 10 candles (in minutes)
+            index_ns = self.data.index[-10:].as_unit('ns').asi8
+            time_diffs = np.diff(index_ns) / 60e9
             
-            avg_diff = sum(time_diffs) / len(time_diffs)
-            min_diff = min(time_diffs)
-            max_diff = max(time_diffs)
+            avg_diff = time_diffs.mean()
+            min_diff = time_diffs.min()
+            max_diff = time_diffs.max()
             
             # Check if the diff is roughly what we expect
             tolerance = 0.1  # 10% tolerance
@@ -411,11 +563,11 @@ class AISlope4Strategy(BaseStrategy):
             return None
             
         # Get the latest close price for entry
-        close_price = self.data['close'].iloc[-1]
+        close_price = self._last_close
         
         # Get multipliers from config
-        sl_mult = self.config['STOP_LOSS_MULTIPLE']
-        tp_mult = self.config['PROFIT_TARGET_MULTIPLE']
+        sl_mult = self.stop_loss_multiple
+        tp_mult = self.profit_target_multiple
         
         # Calculate price levels based on trade type
         entry = close_price  # Use close price for entry
@@ -462,12 +614,14 @@ class AISlope4Strategy(BaseStrategy):
         # CRITICAL: Skip if we have open positions (strategy.position_size != 0)
         # =================================================================
         if self.in_position:
-            print(f"🔒 No new trades allowed: Position already open ({self.position_type})")
+            if self.verbose_logging:
+                print(f"🔒 No new trades allowed: Position already open ({self.position_type})")
             return None
             
         # Double-check open_positions manually (equivalent to strategy.opentrades == 0)
         if open_positions and len(open_positions) > 0:
-            print(f"🔒 No new trades allowed: {len(open_positions)} positions already open")
+            if self.verbose_logging:
+                print(f"🔒 No new trades allowed: {len(open_positions)} positions already open")
             return None
         
         # Skip if we're missing necessary data or indicators
@@ -476,14 +630,14 @@ class AISlope4Strategy(BaseStrategy):
         
         # Get server time and candle boundaries    
         server_time = get_server_time()
-        current_candle_start, current_candle_end = get_candle_boundaries(server_time, self.timeframe)
+        current_candle_start, current_candle_end = _candle_boundaries(server_time, self.timeframe)
         
         # Check if this is a new candle since our last check
         is_new_candle = False
         if self.last_processed_candle_time is None:
             is_new_candle = True
         else:
-            last_candle_start, _ = get_candle_boundaries(self.last_processed_candle_time, self.timeframe)
+            last_candle_start, _ = _candle_boundaries(self.last_processed_candle_time, self.timeframe)
             if current_candle_start > last_candle_start:
                 is_new_candle = True
                 
@@ -498,35 +652,35 @@ class AISlope4Strategy(BaseStrategy):
                 return None
             
             # Get latest price data for crossover detection (current & previous bar)
-            current_close = self.data['close'].iloc[-1]
-            previous_close = self.data['close'].iloc[-2] if len(self.data) > 1 else current_close
-            
-            # Check current ADX value
-            current_adx = self.indicators['adx'].iloc[-1]
-            self.is_adx_low = current_adx < self.config['ADX_LOWER_LEVEL']
+            # (cached by calculate_indicators, which also set is_adx_low)
+            current_close = self._last_close
+            previous_close = self._prev_close
+            current_adx = self._last_adx
             
             # Check direction settings
-            enable_direction = self.config['ENABLE_DIRECTION']
+            enable_direction = self.enable_direction
             can_go_long = enable_direction == 0 or enable_direction == 1
             can_go_short = enable_direction == 0 or enable_direction == -1
             
             # Check for breakouts - EXACTLY match TradingView's cross() function
             # cross(a, b) = a[0] > b[0] and a[1] <= b[1]
+            # (both comparisons are always evaluated and combined with &, no short-circuit branch)
             
             # Long entry: cross(close, boxUpperLevel) - EXACT PineScript implementation
-            cross_above_upper = current_close > self.box_upper_level and previous_close <= self.box_upper_level
+            cross_above_upper = bool((current_close > self.box_upper_level) & (previous_close <= self.box_upper_level))
             
             # Short entry: cross(close, boxLowerLevel) - EXACT PineScript implementation 
-            cross_below_lower = current_close < self.box_lower_level and previous_close >= self.box_lower_level
+            cross_below_lower = bool((current_close < self.box_lower_level) & (previous_close >= self.box_lower_level))
             
             # EXACTLY matching TradingView's logic:
             # isBuyValid = strategy.position_size == 0 and cross(close, boxUpperLevel) and isADXLow
             # isSellValid = strategy.position_size == 0 and cross(close, boxLowerLevel) and isADXLow
-            is_buy_valid = cross_above_upper and self.is_adx_low and can_go_long
-            is_sell_valid = cross_below_lower and self.is_adx_low and can_go_short
+            adx_low = bool(self.is_adx_low)
+            is_buy_valid = cross_above_upper & adx_low & can_go_long
+            is_sell_valid = cross_below_lower & adx_low & can_go_short
             
             if is_buy_valid:
-                print(f"🔼 LONG SIGNAL: Price {current_close:.2f} crossed above box upper {self.box_upper_level:.2f} with ADX {current_adx:.2f} < {self.config['ADX_LOWER_LEVEL']} (Consolidation)")
+                print(f"🔼 LONG SIGNAL: Price {current_close:.2f} crossed above box upper {self.box_upper_level:.2f} with ADX {current_adx:.2f} < {self.adx_lower_level:g} (Consolidation)")
                 print(f"✅ NO OPEN POSITIONS - New trade allowed")
                 
                 # Calculate price levels for trade
@@ -549,7 +703,7 @@ class AISlope4Strategy(BaseStrategy):
                 return signal_type, entry_price, sl_price, tp_price
                 
             elif is_sell_valid:
-                print(f"🔽 SHORT SIGNAL: Price {current_close:.2f} crossed below box lower {self.box_lower_level:.2f} with ADX {current_adx:.2f} < {self.config['ADX_LOWER_LEVEL']} (Consolidation)")
+                print(f"🔽 SHORT SIGNAL: Price {current_close:.2f} crossed below box lower {self.box_lower_level:.2f} with ADX {current_adx:.2f} < {self.adx_lower_level:g} (Consolidation)")
                 print(f"✅ NO OPEN POSITIONS - New trade allowed")
                 
                 # Calculate price levels for trade
@@ -571,18 +725,64 @@ class AISlope4Strategy(BaseStrategy):
                 
                 return signal_type, entry_price, sl_price, tp_price
         
-        # Always print the current box & ADX status for the most recent bar
-        if not self.data.empty and 'adx' in self.indicators:
-            current_adx = self.indicators['adx'].iloc[-1]
+        # Current box & ADX status for the most recent bar (verbose only: runs every tick)
+        if self.verbose_logging and not self.data.empty and 'adx' in self.indicators:
+            current_adx = self._last_adx
             adx_status = "LOW ✓" if self.is_adx_low else "HIGH ✗" 
             position_status = f"IN {self.position_type}" if self.in_position else "NO POSITION"
             
             if self.box_upper_level is not None and self.box_lower_level is not None:
-                print(f"Upper={self.box_upper_level:.2f}, Lower={self.box_lower_level:.2f} | ADX={current_adx:.2f}/{self.config['ADX_LOWER_LEVEL']} ({adx_status}) | {position_status}")
+                print(f"Upper={self.box_upper_level:.2f}, Lower={self.box_lower_level:.2f} | ADX={current_adx:.2f}/{self.adx_lower_level:g} ({adx_status}) | {position_status}")
         
         # No valid signal
         return None
     
+    def generate_signals_vectorized(self):
+        """
+        Vectorized entry signals over the whole of self.data, for backtests.
+        
+        Every bar is evaluated the way generate_entry_signal evaluates the current
+        bar: the box is the highest high / lowest low of the BOX_LOOKBACK bars before
+        it, the close must cross out of the box from the previous close, and the
+        bar's ADX must be below ADX_LOWER_LEVEL. As in the live path, no bar signals
+        before ADX_PERIOD + ADX_SMOOTH_PERIOD candles of data are available. Open
+        positions are not modelled, so the box is never held while in a trade;
+        signals raised while a position is open must be dropped by the caller.
+        
+        Returns:
+            ndarray: int8 per bar of self.data: 1 = BUY, -1 = SELL, 0 = no signal
+        """
+        high, low, close = self._high, self._low, self._close
+        box_lookback = self.box_lookback
+        signals = np.zeros(len(close), dtype=np.int8)
+        if len(close) <= box_lookback:
+            return signals
+        
+        adx, _, _ = adx_wilder(high, low, close, self.adx_period, self.adx_smooth_period)
+        
+        # Box of bar i (from i = box_lookback on) covers bars i-box_lookback .. i-1.
+        # bottleneck's moving extrema are O(n); without it, take them over strided windows.
+        if move_max is not None:
+            upper = move_max(high, box_lookback)[box_lookback - 1:-1]
+            lower = move_min(low, box_lookback)[box_lookback - 1:-1]
+        else:
+            upper = sliding_window_view(high[:-1], box_lookback).max(axis=1)
+            lower = sliding_window_view(low[:-1], box_lookback).min(axis=1)
+        current_close = close[box_lookback:]
+        previous_close = close[box_lookback - 1:-1]
+        adx_low = adx[box_lookback:] < self.adx_lower_level
+        
+        enable_direction = self.enable_direction
+        if enable_direction == 0 or enable_direction == 1:
+            signals[box_lookback:] += (current_close > upper) & (previous_close <= upper) & adx_low
+        if enable_direction == 0 or enable_direction == -1:
+            signals[box_lookback:] -= (current_close < lower) & (previous_close >= lower) & adx_low
+        
+        # The live path skips bars until it has ADX_PERIOD + ADX_SMOOTH_PERIOD of data
+        # (see calculate_indicators), although adx_wilder is finite a bar earlier
+        signals[:self.adx_period + self.adx_smooth_period - 1] = 0
+        return signals
+    
     def generate_exit_signal(self, position):
         """
         Generate exit signals based on take profit and stop loss levels.
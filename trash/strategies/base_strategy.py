@@ -1,7 +1,25 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 import MetaTrader5 as mt5  # Import for constants and types
 
+# Last-row columns cached for get_market_price
+_TAIL_COLUMNS = ('ask', 'bid', 'close')
+
+# Price columns handed to indicator kernels (see BaseStrategy.kernel_indicators)
+_OHLC_COLUMNS = ['open', 'high', 'low', 'close']
+
+def _config_bool(value):
+    """Config value as a bool, parsing strings like 'true', 'False', '1' or 'off'"""
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ('1', 'true', 'yes', 'on'):
+            return True
+        if text in ('0', 'false', 'no', 'off', ''):
+            return False
+        raise ValueError(f"Cannot interpret config value {value!r} as a boolean")
+    return bool(value)
+
 class BaseStrategy(ABC):
     """
     Abstract Base Class for all trading strategies.
@@ -9,8 +27,16 @@ class BaseStrategy(ABC):
     This class defines the common interface and shared functionality for trading strategies.
     Concrete strategy implementations should inherit from this class.
     """
+    
+    # Fixed slots for the attributes every strategy has. The current subclasses don't
+    # declare __slots__, so their instances still carry a __dict__; a subclass that
+    # declares its own gets dict-free instances.
+    __slots__ = ('symbol', 'timeframe', 'symbol_info', 'config', 'copy_on_update', 'data', 'prev_signal',
+                 '_point', '_digits', '_min_stop_distance',
+                 '_tail', '_tail_source', '_ohlcv', '_ohlcv_source',
+                 '_kernel_out', '_kernel_source')
 
-    def __init__(self, symbol, timeframe, symbol_info, strategy_config=None):
+    def __init__(self, symbol, timeframe, symbol_info, strategy_config=None, copy_on_update=False):
         """
         Initialize the strategy.
 
@@ -19,34 +45,58 @@ class BaseStrategy(ABC):
             timeframe (int): The MT5 timeframe constant.
             symbol_info (mt5.SymbolInfo): MT5 symbol information object.
             strategy_config (dict, optional): Strategy-specific configuration. Defaults to None.
+            copy_on_update (bool, optional): Copy the DataFrame passed to update_data instead of
+                keeping a reference to it. Only needed when the caller mutates the frame after
+                handing it over. Defaults to False.
         """
         self.symbol = symbol
         self.timeframe = timeframe
         self.symbol_info = symbol_info
         self.config = strategy_config or {}
+        self.copy_on_update = copy_on_update
         self.data = pd.DataFrame()  # To store historical data and indicators
         self.prev_signal = None     # For tracking previous trade direction
+        
+        # Symbol-static values. The point is needed for every stop calculation, so a
+        # symbol without one fails at startup; digits are resolved on first use.
+        self._point = self._resolve_point()
+        self._digits = None
+        self._min_stop_distance = (getattr(symbol_info, 'trade_stops_level', 0) or 0) * self._point
+        
+        # Last-row prices of self.data as floats (see _refresh_tail)
+        self._tail = {}
+        self._tail_source = self.data
+        
+        # (N, 5) float64 OHLCV array of self.data (see _ohlcv_array)
+        self._ohlcv = None
+        self._ohlcv_source = None
+        
+        # Last _indicator_kernel result and the OHLCV array it was computed from
+        self._kernel_out = {}
+        self._kernel_source = None
     
-    def get_point_value(self):
+    def _resolve_point(self):
         """
-        Get the symbol's point value from MT5.
+        Resolve the symbol's point value from symbol_info.
         
-        The point value is crucial for proper calculation of stop levels,
-        position sizing, and price movements.
+        Subclasses that accept a guessed point for symbols without one override this
+        (EMAStrategy uses DataFetcher.get_symbol_point and its fallbacks).
         
         Returns:
-            float: The point value for the symbol
+            float: symbol_info.point, or trade_tick_size when point is unavailable
             
         Raises:
             ValueError: If the point value cannot be determined
         """
         # First try to get point directly from symbol_info
-        if hasattr(self.symbol_info, 'point') and self.symbol_info.point > 0:
-            return self.symbol_info.point
+        point = getattr(self.symbol_info, 'point', 0) or 0
+        if point > 0:
+            return float(point)
             
         # Alternative way to get point value
-        elif hasattr(self.symbol_info, 'trade_tick_size') and self.symbol_info.trade_tick_size > 0:
-            return self.symbol_info.trade_tick_size
+        tick_size = getattr(self.symbol_info, 'trade_tick_size', 0) or 0
+        if tick_size > 0:
+            return float(tick_size)
             
         # If we can't get a valid point value, we should raise an error
         # This is a critical value for trading calculations and we can't guess
@@ -56,11 +106,9 @@ class BaseStrategy(ABC):
             f"Make sure the symbol is correctly specified and MT5 connection is valid."
         )
 
-    def get_digits(self):
+    def _resolve_digits(self):
         """
-        Get the number of decimal digits for the symbol from MT5.
-        
-        This is used for proper price rounding in orders.
+        Resolve the number of decimal digits from symbol_info.
         
         Returns:
             int: Number of decimal digits
@@ -69,7 +117,7 @@ class BaseStrategy(ABC):
             ValueError: If the digits value cannot be determined
         """
         if hasattr(self.symbol_info, 'digits'):
-            return self.symbol_info.digits
+            return int(self.symbol_info.digits)
             
         # If we can't get a valid digits value, raise an error
         raise ValueError(
@@ -77,19 +125,81 @@ class BaseStrategy(ABC):
             f"Symbol info lacks 'digits' attribute. "
             f"Make sure the symbol is correctly specified and MT5 connection is valid."
         )
+    
+    def get_point_value(self):
+        """
+        Get the symbol's point value from MT5.
+        
+        The point value is crucial for proper calculation of stop levels,
+        position sizing, and price movements. It is symbol-static, so it is
+        resolved once when the strategy is created.
+        
+        Returns:
+            float: The point value for the symbol
+        """
+        return self._point
+
+    def get_digits(self):
+        """
+        Get the number of decimal digits for the symbol from MT5.
+        
+        This is used for proper price rounding in orders. Resolved on the first call
+        and cached, so strategies that never round prices don't need 'digits'.
+        
+        Returns:
+            int: Number of decimal digits
+            
+        Raises:
+            ValueError: If the digits value cannot be determined
+        """
+        digits = self._digits
+        if digits is None:
+            digits = self._digits = self._resolve_digits()
+        return digits
+
+    def calc_stop_distance_vec(self, prices, risk):
+        """
+        Stop distance for a whole price series, for backtests: `risk` as a fraction
+        of each price, but never less than the broker's minimum stop distance.
+        
+        Args:
+            prices (ndarray): Entry prices
+            risk (float): Stop distance as a fraction of price (e.g. 0.01 for 1%)
+            
+        Returns:
+            ndarray: Stop distance per price
+        """
+        return np.maximum(np.asarray(prices, dtype=np.float64) * risk, self._min_stop_distance)
 
     def update_data(self, new_data):
         """
         Updates the strategy's internal data cache. Can be overridden for complex merging.
         Default implementation replaces the data.
         
+        The frame is kept by reference (the trader fetches a new one every tick), so the
+        caller must not modify it afterwards unless the strategy was created with
+        copy_on_update=True.
+        
         Args:
             new_data (DataFrame): New price and indicator data
         """
         if new_data is not None and not new_data.empty:
-            self.data = new_data.copy()
+            self.data = new_data.copy() if self.copy_on_update else new_data
+            self._refresh_tail()
             #print(f"Strategy data updated. Last candle time: {self.data.index[-1]}")
     
+    def _refresh_tail(self):
+        """
+        Cache the last row's ask/bid/close of self.data as plain floats, so the
+        per-tick price lookups don't go through pandas indexing.
+        """
+        data = self.data
+        if data.empty:
+            self._tail = {}
+        else:
+            self._tail = {c: float(data[c].to_numpy()[-1]) for c in _TAIL_COLUMNS if c in data.columns}
+        self._tail_source = data
+    
     def get_market_price(self, order_type):
         """
         Get the appropriate market price for a given order type.
@@ -100,15 +210,20 @@ class BaseStrategy(ABC):
         Returns:
             float: The appropriate price for the order type
         """
+        # Subclasses that assign self.data themselves bypass update_data
+        if self._tail_source is not self.data:
+            self._refresh_tail()
+        tail = self._tail
+        
         # Check if bid/ask in dataframe (for backtesting support)
-        if not self.data.empty:
-            if order_type == mt5.ORDER_TYPE_BUY and 'ask' in self.data.columns:
-                return self.data['ask'].iloc[-1]
-            elif order_type == mt5.ORDER_TYPE_SELL and 'bid' in self.data.columns:
-                return self.data['bid'].iloc[-1]
+        if tail:
+            if order_type == mt5.ORDER_TYPE_BUY and 'ask' in tail:
+                return tail['ask']
+            elif order_type == mt5.ORDER_TYPE_SELL and 'bid' in tail:
+                return tail['bid']
             else:
                 # Fallback to close price with warning
-                price = self.data['close'].iloc[-1]
+                price = tail['close']
                 direction = "BUY" if order_type == mt5.ORDER_TYPE_BUY else "SELL"
                 print(f"⚠️ Warning: Using close price instead of {'ask' if order_type == mt5.ORDER_TYPE_BUY else 'bid'} price for {direction} order")
                 return price
@@ -116,6 +231,57 @@ class BaseStrategy(ABC):
         # Default fallback (should not reach here normally)
         return None
 
+    def _ohlcv_array(self):
+        """
+        self.data's open, high, low, close and volume as a C-contiguous float64 (N, 5)
+        array, built once per data update. MT5 rates have no 'volume' column, so
+        'tick_volume' is used in its place.
+        
+        Returns:
+            ndarray: OHLCV array, one row per candle
+        """
+        data = self.data
+        if self._ohlcv_source is not data:
+            volume_col = 'volume' if 'volume' in data.columns else 'tick_volume'
+            self._ohlcv = np.ascontiguousarray(data[_OHLC_COLUMNS + [volume_col]].to_numpy(dtype=np.float64))
+            self._ohlcv_source = data
+        return self._ohlcv
+    
+    def _indicator_kernel(self, ohlcv):
+        """
+        Numeric indicator stage for the opt-in kernel path (see kernel_indicators).
+        
+        Subclasses that compute their indicators from plain arrays override this and
+        call their kernels from it (decorated with njit from strategies._njit, so numba
+        stays optional).
+        
+        Args:
+            ohlcv (ndarray): float64 (N, 5) array of open, high, low, close, volume
+            
+        Returns:
+            dict: Indicator name -> ndarray of length N
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement _indicator_kernel")
+
+    def kernel_indicators(self):
+        """
+        Run _indicator_kernel on the OHLCV array of self.data, once per data update.
+        
+        Opt-in helper for calculate_indicators implementations. The results are kept
+        in strategy-owned arrays; self.data is never modified, since update_data keeps
+        the caller's DataFrame by reference.
+        
+        Returns:
+            dict: Indicator name -> ndarray of length N (empty when there is no data)
+        """
+        if self.data.empty:
+            return {}
+        ohlcv = self._ohlcv_array()
+        if self._kernel_source is not ohlcv:
+            self._kernel_out = self._indicator_kernel(ohlcv)
+            self._kernel_source = ohlcv
+        return self._kernel_out
+
     @abstractmethod
     def calculate_indicators(self):
         """
@@ -174,6 +340,29 @@ class BaseStrategy(ABC):
             The configuration value or default
         """
         return self.config.get(key, default)
+
+    def _resolve_config(self, schema):
+        """
+        Resolve config values read on every tick into typed attributes, once, so the
+        hot path reads self.<name> instead of going through config lookups.
+        
+        Args:
+            schema (dict): Config key -> (type, default). Each value is read with
+                get_config, converted with the type and stored as self.<key lowercased>.
+                A missing or None value gives the default; for bool, strings such as
+                'False' or '0' are parsed rather than taken as truthy.
+                
+        Raises:
+            ValueError: If an attribute name is already used by the strategy
+        """
+        for key, (cast, default) in schema.items():
+            name = key.lower()
+            if hasattr(self, name):
+                raise ValueError(f"Config key {key} would overwrite {type(self).__name__}.{name}")
+            value = self.get_config(key, default)
+            if value is None:
+                value = default
+            setattr(self, name, _config_bool(value) if cast is bool else cast(value))
     
     def reset_signal_state(self):
         """Reset strategy internal state after position closing or failed orders."""
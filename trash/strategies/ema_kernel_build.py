@@ -0,0 +1,54 @@
+"""
+Ahead-of-time build of the EMA strategy kernels.
+
+Compiles the numba kernels from _ema_kernels.py into a native extension module
+(_ema_kernels_aot) next to this file, so the strategy starts without any JIT
+compilation. ema_strategy.py uses the compiled module when it is present and
+falls back to the JIT kernels otherwise. Rebuild after changing _ema_kernels.py,
+since the compiled module does not track the source.
+
+Run from the trash/ directory (requires numba):
+    python -m strategies.ema_kernel_build
+"""
+
+import os
+from numba.pycc import CC
+from strategies import _ema_kernels as kernels
+
+cc = CC('_ema_kernels_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.verbose = True
+
+
+@cc.export('slope', 'float64(float64[:], int64)')
+def slope(values, periods):
+    return kernels.slope(values, periods)
+
+
+@cc.export('crossover_codes', 'int8[:](float64[:])')
+def crossover_codes(diff):
+    return kernels.crossover_codes(diff)
+
+
+@cc.export('detect_crossover', 'Tuple((int64, int64, boolean))(float64[:], int64, boolean, boolean)')
+def detect_crossover(diff, lookback, buy_allowed, sell_allowed):
+    return kernels.detect_crossover(diff, lookback, buy_allowed, sell_allowed)
+
+
+@cc.export('signal_checks', 'Tuple((boolean, boolean, boolean, float64))'
+           '(float64[:], float64[:], float64[:], boolean, int64, float64, float64, float64)')
+def signal_checks(fast, slow, close, is_buy, slope_periods, min_slope, min_separation, inv_point):
+    return kernels.signal_checks(fast, slow, close, is_buy, slope_periods, min_slope, min_separation, inv_point)
+
+
+@cc.export('entry_signal', 'Tuple((int64, int64, boolean, boolean, boolean, float64))'
+           '(float64[:], float64[:], float64[:], float64[:], int64, boolean, boolean, int64, float64, float64, float64)')
+def entry_signal(fast, slow, diff, close, lookback, buy_allowed, sell_allowed,
+                 slope_periods, min_slope, min_separation, inv_point):
+    return kernels.entry_signal(fast, slow, diff, close, lookback, buy_allowed, sell_allowed,
+                                slope_periods, min_slope, min_separation, inv_point)
+
+
+if __name__ == '__main__':
+    cc.compile()
+    print(f"✅ Compiled EMA kernels into {cc.output_dir}")
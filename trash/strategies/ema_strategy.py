@@ -1,74 +1,361 @@
 import MetaTrader5 as mt5
 import numpy as np
+import pandas as pd
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import MappingProxyType, SimpleNamespace
+from typing import Final, Optional, Tuple, Union
 from strategies.base_strategy import BaseStrategy
-import importlib
+try:
+    # Ahead-of-time compiled kernels (built by ema_kernel_build.py): no JIT warmup at startup
+    from strategies._ema_kernels_aot import slope, crossover_codes, detect_crossover, signal_checks, entry_signal
+except ImportError:
+    from strategies._ema_kernels import slope, crossover_codes, detect_crossover, signal_checks, entry_signal
 import sys
 
-# Add parent directory to path to import get_candle_boundaries
-sys.path.append('..')
-# Try to import from the parent module
+# generic_trader lives in the project root. It is normally importable already (the
+# trader is run from there); only extend sys.path when it is not, e.g. when running
+# from a subdirectory.
 try:
-    from generic_trader import get_candle_boundaries, get_server_time
+    from generic_trader import get_candle_boundaries, get_server_time, CORE_CONFIG, DataFetcher
 except ImportError:
-    # If import fails, raise the error
-    raise
+    sys.path.append('..')
+    from generic_trader import get_candle_boundaries, get_server_time, CORE_CONFIG, DataFetcher
 
 # Signal Filter Parameters (from ema_crossover_strategy.py)
-SIGNAL_FILTERS = {
-    'MIN_CROSSOVER_POINTS': 10,  # Minimum points required for initial crossover
-    'MIN_SEPARATION_POINTS': 2,  # Minimum separation after crossover
-    'SLOPE_PERIODS': 3,  # Periods to calculate slope over
-    'MIN_SLOPE_THRESHOLD': 0.000001,  # Minimum slope for trend direction
-    'MAX_OPPOSITE_SLOPE': -0.000002,  # Maximum allowed opposite slope
-    'LOOKBACK_CANDLES': 3,  # Number of recent candles to check for crossover
+# Plain module constants: fixed at runtime, so the hot path skips dict lookups
+MIN_CROSSOVER_POINTS: Final[int] = 10  # Minimum points required for initial crossover
+MIN_SEPARATION_POINTS: Final[int] = 2  # Minimum separation after crossover
+SLOPE_PERIODS: Final[int] = 3  # Periods to calculate slope over
+MIN_SLOPE_THRESHOLD: Final[float] = 0.000001  # Minimum slope for trend direction
+MAX_OPPOSITE_SLOPE: Final[float] = -0.000002  # Maximum allowed opposite slope
+LOOKBACK_CANDLES: Final[int] = 3  # Number of recent candles to check for crossover
+
+# Candles kept in the SoA signal buffer: covers the slope fit, the crossover lookback
+# and the 10-candle minimum checked in generate_entry_signal
+_TAIL_LEN: Final[int] = 16
+
+# MT5 order/position type constants, bound once for the per-tick signal checks
+_OT_BUY: Final[int] = mt5.ORDER_TYPE_BUY
+_OT_SELL: Final[int] = mt5.ORDER_TYPE_SELL
+_PT_BUY: Final[int] = mt5.POSITION_TYPE_BUY
+_PT_SELL: Final[int] = mt5.POSITION_TYPE_SELL
+
+# Candle length in seconds of the standard MT5 timeframes. Candles of these sit on a
+# fixed grid, so their boundaries are one integer divide away; anything else goes
+# through get_candle_boundaries.
+_TF_SECONDS = {
+    mt5.TIMEFRAME_M1: 60,
+    mt5.TIMEFRAME_M5: 300,
+    mt5.TIMEFRAME_M15: 900,
+    mt5.TIMEFRAME_M30: 1800,
+    mt5.TIMEFRAME_H1: 3600,
+    mt5.TIMEFRAME_H4: 14400,
+    mt5.TIMEFRAME_D1: 86400,
 }
 
+# Read-only view for code that looks the filters up by name
+SIGNAL_FILTERS = MappingProxyType({
+    'MIN_CROSSOVER_POINTS': MIN_CROSSOVER_POINTS,
+    'MIN_SEPARATION_POINTS': MIN_SEPARATION_POINTS,
+    'SLOPE_PERIODS': SLOPE_PERIODS,
+    'MIN_SLOPE_THRESHOLD': MIN_SLOPE_THRESHOLD,
+    'MAX_OPPOSITE_SLOPE': MAX_OPPOSITE_SLOPE,
+    'LOOKBACK_CANDLES': LOOKBACK_CANDLES,
+})
+
 # EMA Strategy Configuration
 EMA_STRATEGY_CONFIG = {
     'USE_EMA_EXIT_SIGNALS': False,  # Toggle for EMA-based exit signals (disabled by default)
 }
 
+# Strategy messages; handlers and level are set up by the application (generic_trader's
+# main logs to stdout at INFO). The per-signal analysis lines are DEBUG, so they are
+# skipped entirely at INFO.
+log = logging.getLogger(__name__)
+
+def _evaluate_entry(strategy, open_positions):
+    """Worker for run_strategies_parallel: returns the signal plus the state it may change"""
+    signal = strategy.generate_entry_signal(open_positions)
+    return signal, strategy.prev_signal, strategy.last_trade_close_time
+
+def run_strategies_parallel(strategies, open_positions=None, max_workers=None):
+    """
+    Evaluate entry signals for several independent EMAStrategy instances in parallel processes.
+    
+    Each strategy is pickled to a worker, so this pays off for backtests or scans over many
+    symbols rather than a single live symbol. Signal state changed in the worker
+    (prev_signal, last_trade_close_time) is copied back onto the original instances.
+    
+    Args:
+        strategies (list): EMAStrategy instances with data and indicators already loaded
+        open_positions (dict, optional): {symbol: list of open positions}
+        max_workers (int, optional): Number of worker processes (defaults to os.cpu_count())
+        
+    Returns:
+        list: Entry signal (or None) for each strategy, in the same order
+    """
+    open_positions = open_positions or {}
+    results = [None] * len(strategies)
+    
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(_evaluate_entry, strategy, open_positions.get(strategy.symbol)): i
+            for i, strategy in enumerate(strategies)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            signal, prev_signal, last_trade_close_time = future.result()
+            strategies[i].prev_signal = prev_signal
+            strategies[i].last_trade_close_time = last_trade_close_time
+            results[i] = signal
+            
+    return results
+
 class EMAStrategy(BaseStrategy):
     """Implementation of EMA crossover strategy compatible with generic_trader framework"""
     
+    # Least-squares slope weights per period, shared by all instances (see calculate_slope)
+    _slope_weights = {}
+    
     def __init__(self, symbol, timeframe, symbol_info, strategy_config=None):
         """Initialize the strategy with default parameters"""
         super().__init__(symbol, timeframe, symbol_info, strategy_config)
         self.last_trade_close_time = None  # Track when last trade was closed
         
+        # Reciprocal of the point size (see _resolve_point), for the hot path
+        self._inv_point = 1.0 / self._point
+        
+        # Candle length in ns for grid timeframes (None: use get_candle_boundaries)
+        tf_seconds = _TF_SECONDS.get(timeframe)
+        self._tf_ns = tf_seconds * 1_000_000_000 if tf_seconds else None
+        
+        # Fixed-size SoA buffer holding the fast EMA, slow EMA, EMA gap and close tails
+        # (rows 0-3). self._fe / self._se / self._diff / self._cl are contiguous views of
+        # its filled part.
+        self._bars = np.empty((4, _TAIL_LEN))
+        self._bar_count = 0
+        self._arrays_source = None  # DataFrame the buffer was last loaded from
+        self._refresh_views()
+        
+        # Streaming EMA state for update_indicators: [tema ema1, ema2, ema3, slow ema]
+        # Periods match the fast_ema (TEMA) / slow_ema columns built by DataFetcher.
+        self._ema_state = None
+        self._alpha_fast = 2.0 / (CORE_CONFIG['FAST_EMA'] + 1)
+        self._alpha_slow = 2.0 / (CORE_CONFIG['SLOW_EMA'] + 1)
+        
+        # Candle start times (epoch ns) of self.data, see get_candles_after_last_trade
+        self._candle_starts = None
+        self._candle_starts_source = None
+        
+        # Bar time and inputs of the last entry check that found no signal (see generate_entry_signal)
+        self._last_seen_bar_time = None
+        self._last_seen_values = None
+        
+    def __getstate__(self):
+        """
+        Pickle support for process pools: the MT5 symbol info is replaced by a plain
+        snapshot of its fields and the buffer views are rebuilt on unpickling.
+        """
+        # BaseStrategy declares __slots__, so the default state is (__dict__, slot values)
+        state, slots = super().__getstate__()
+        state = {name: value for name, value in state.items() if name not in ('_fe', '_se', '_diff', '_cl')}
+        if hasattr(self.symbol_info, '_asdict'):
+            slots = {**slots, 'symbol_info': SimpleNamespace(**self.symbol_info._asdict())}
+        return state, slots
+        
+    def __setstate__(self, state):
+        """Restore pickled (__dict__, slot values) state and re-point the views at the SoA buffer"""
+        for part in state:
+            for name, value in part.items():
+                setattr(self, name, value)
+        self._refresh_views()
+        
+    def _resolve_point(self):
+        """
+        Resolve the point size the same way the trade executor does, with
+        DataFetcher.get_symbol_point's fallbacks for JPY pairs, gold and Bitcoin.
+        
+        Returns:
+            float: The point value for the symbol
+            
+        Raises:
+            ValueError: If the point value cannot be determined
+        """
+        return float(DataFetcher.get_symbol_point(self.symbol_info))
+        
+    def _refresh_views(self):
+        """Point self._fe, self._se, self._diff and self._cl at the filled tail of the SoA buffer"""
+        self._fe, self._se, self._diff, self._cl = self._bars[:, self._bars.shape[1] - self._bar_count:]
+        self._bar_flags = None  # latest-bar crossover flags, see bar_crossover_flags
+        self._signal_checks = {}  # direction -> _validate_signal result for this buffer
+        
+    def _arrays(self):
+        """
+        Get the fast EMA, slow EMA, EMA gap and close tail arrays.
+        
+        The buffer is reloaded only when self.data has been replaced since it was last
+        loaded (e.g. update_data without calculate_indicators); otherwise this is a single
+        identity check.
+        
+        Returns:
+            tuple: (fast, slow, diff, close) float64 arrays, oldest first
+        """
+        if self._arrays_source is not self.data:
+            self.calculate_indicators()
+        return self._fe, self._se, self._diff, self._cl
+        
     def calculate_indicators(self):
         """
         The indicators are already calculated in the DataFetcher class in generic_trader.py
-        This function is only required by the BaseStrategy interface but doesn't need to do anything.
+        Here we only copy the tail of the EMA/close columns into the SoA buffer so the
+        signal checks work on small contiguous float64 arrays instead of pandas objects.
+        """
+        count = min(len(self.data), self._bars.shape[1])
+        if count:
+            self._bars[0, -count:] = self.data['fast_ema'].to_numpy(copy=False)[-count:]
+            self._bars[1, -count:] = self.data['slow_ema'].to_numpy(copy=False)[-count:]
+            self._bars[3, -count:] = self.data['close'].to_numpy(copy=False)[-count:]
+            if 'ema_diff' in self.data.columns:
+                self._bars[2, -count:] = self.data['ema_diff'].to_numpy(copy=False)[-count:]
+            else:
+                np.subtract(self._bars[0, -count:], self._bars[1, -count:], out=self._bars[2, -count:])
+        self._bar_count = count
+        self._arrays_source = self.data
+        self._refresh_views()
+        
+        # Columns were rebuilt upstream; reseed the streaming EMAs on next use
+        self._ema_state = None
+        
+    def on_new_bar(self, fast_ema, slow_ema, close):
+        """
+        Append a single bar to the SoA buffer without rebuilding it from self.data.
+        
+        The buffer keeps its source: if it was not loaded from the current self.data,
+        the next _arrays call still reloads it from there.
+        
+        Args:
+            fast_ema (float): Fast EMA value of the new bar
+            slow_ema (float): Slow EMA value of the new bar
+            close (float): Close price of the new bar
+        """
+        bars = self._bars
+        bars[:, :-1] = bars[:, 1:]
+        bars[:, -1] = (fast_ema, slow_ema, fast_ema - slow_ema, close)
+        self._bar_count = min(self._bar_count + 1, bars.shape[1])
+        self._refresh_views()
+        
+    def update_indicators(self, new_close):
         """
-        pass
+        Fold a new bar's close into the fast (TEMA) and slow EMAs and append the bar,
+        instead of recomputing both columns over the whole window.
+        
+        Each EMA is one multiply-add per bar (ema += alpha * (close - ema)). The state is
+        seeded from self.data on first use and after calculate_indicators rebuilds the
+        columns; seeding runs full ewm passes over self.data (the TEMA's inner EMAs are
+        not among its columns). The O(1) update therefore only pays off when bars are
+        fed through this method instead of update_data + calculate_indicators; in the
+        trader's fetch loop, which reloads the columns every bar, it is O(N) per bar.
+        
+        Args:
+            new_close (float): Close price of the new bar
+            
+        Returns:
+            tuple: (fast_ema, slow_ema) values for the new bar
+        """
+        # Load the window first, so the new bar lands on top of it rather than on a
+        # buffer left over from earlier data
+        if self._arrays_source is not self.data:
+            self._arrays()
+            
+        if self._ema_state is None:
+            if self.data.empty:
+                # Same start as ewm(adjust=False): the first value is the close itself
+                self._ema_state = [new_close] * 4
+            else:
+                closes = self.data['close']
+                span = CORE_CONFIG['FAST_EMA']
+                ema1 = closes.ewm(span=span, adjust=False).mean()
+                ema2 = ema1.ewm(span=span, adjust=False).mean()
+                ema3 = ema2.ewm(span=span, adjust=False).mean()
+                slow = closes.ewm(span=CORE_CONFIG['SLOW_EMA'], adjust=False).mean()
+                self._ema_state = [ema1.iat[-1], ema2.iat[-1], ema3.iat[-1], slow.iat[-1]]
+                
+        ema1, ema2, ema3, slow_ema = self._ema_state
+        alpha = self._alpha_fast
+        ema1 += alpha * (new_close - ema1)
+        ema2 += alpha * (ema1 - ema2)
+        ema3 += alpha * (ema2 - ema3)
+        slow_ema += self._alpha_slow * (new_close - slow_ema)
+        self._ema_state = [ema1, ema2, ema3, slow_ema]
+        
+        fast_ema = 3 * ema1 - 3 * ema2 + ema3
+        self.on_new_bar(fast_ema, slow_ema, new_close)
+        return fast_ema, slow_ema
         
     def get_required_data_count(self):
         """Return the minimum number of candles needed for this strategy"""
         return 50  # Should be enough for EMA calculation and analysis
     
-    def calculate_slope(self, series, periods=SIGNAL_FILTERS['SLOPE_PERIODS']):
+    def calculate_slope(self, series: Union[pd.Series, np.ndarray], periods: int = SLOPE_PERIODS) -> float:
         """
         Calculate the slope of a series over specified periods
         
         Args:
-            series (Series): Data series to calculate slope for
+            series (Series or ndarray): Data series to calculate slope for
             periods (int): Number of periods to use
             
         Returns:
             float: The calculated slope value
         """
-        if len(series) < periods:
-            return 0
+        if isinstance(series, pd.Series):
+            values = series.to_numpy(dtype=np.float64, copy=False)
+        else:
+            values = np.asarray(series, dtype=np.float64)
+        if len(values) < periods:
+            return 0.0
+        
+        # Default 3-period fit: closed form in _ema_kernels.slope. The tail is copied since
+        # pandas can hand out read-only buffers, which the compiled signature rejects.
+        if periods == 3:
+            return slope(np.array(values[-3:]), 3)
+        
+        # Other periods: slope = sum((x - mean_x) * y) / sum((x - mean_x)^2), where the
+        # weights depend only on the period, so they are built once and reused
+        weights = self._slope_weights.get(periods)
+        if weights is None:
+            centred = np.arange(periods) - (periods - 1) / 2
+            weights = centred / np.dot(centred, centred)
+            self._slope_weights[periods] = weights
+        return float(np.dot(weights, values[-periods:]))
+    
+    def _validate_signal(self, direction: str) -> Tuple[bool, bool, bool, float]:
+        """
+        Run the slope, separation and price confirmation checks for a signal in one pass.
+        The result is reused until the buffer changes, so the separate check_* calls for
+        the same direction share one kernel call.
         
-        y = series[-periods:].values
-        x = np.arange(len(y))
-        slope, _ = np.polyfit(x, y, 1)
-        return slope
+        Args:
+            direction (str): Trade direction to check for ("BUY" or "SELL")
+            
+        Returns:
+            tuple: (slope_ok, sep_ok, price_ok, diff_points)
+        """
+        fe, se, _, cl = self._arrays()
+        checks = self._signal_checks.get(direction)
+        if checks is None:
+            checks = signal_checks(
+                fe, se, cl, direction == "BUY",
+                SLOPE_PERIODS, MIN_SLOPE_THRESHOLD, MIN_SEPARATION_POINTS, self._inv_point)
+            self._signal_checks[direction] = checks
+        return checks
     
-    def check_slope_conditions(self, direction="BUY"):
+    def check_slope_conditions(self, direction: str = "BUY") -> bool:
         """
-        Check if slope conditions are met for the given trade direction
+        Check if slope conditions are met for the given trade direction.
+        Flat EMAs get a more lenient rule; otherwise the fast EMA just needs
+        to be moving in the trade direction.
         
         Args:
             direction (str): Trade direction to check for ("BUY" or "SELL")
@@ -76,35 +363,12 @@ class EMAStrategy(BaseStrategy):
         Returns:
             bool: True if slope conditions are met
         """
-        if len(self.data) < SIGNAL_FILTERS['SLOPE_PERIODS']:
+        if len(self._arrays()[0]) < SLOPE_PERIODS:
             return False
             
-        fast_slope = self.calculate_slope(self.data['fast_ema'])
-        slow_slope = self.calculate_slope(self.data['slow_ema'])
-        
-        # Check if EMAs are relatively flat
-        is_flat = (abs(fast_slope) < SIGNAL_FILTERS['MIN_SLOPE_THRESHOLD']/2 and 
-                  abs(slow_slope) < SIGNAL_FILTERS['MIN_SLOPE_THRESHOLD']/2)
-        
-        # Relaxed slope conditions for early detection
-        if direction == "BUY":
-            if is_flat:
-                # For flat trends, be more lenient
-                slope_ok = fast_slope >= 0 and slow_slope > -SIGNAL_FILTERS['MIN_SLOPE_THRESHOLD']
-            else:
-                # Relaxed condition - just need fast EMA going up
-                slope_ok = fast_slope > 0
-            return slope_ok
-        else:  # SELL
-            if is_flat:
-                # For flat trends, be more lenient
-                slope_ok = fast_slope <= 0 and slow_slope < SIGNAL_FILTERS['MIN_SLOPE_THRESHOLD']
-            else:
-                # Relaxed condition - just need fast EMA going down
-                slope_ok = fast_slope < 0
-            return slope_ok
+        return self._validate_signal(direction)[0]
     
-    def check_separation(self, direction="BUY"):
+    def check_separation(self, direction: str = "BUY") -> bool:
         """
         Check if EMAs have sufficient separation after crossover
         
@@ -114,24 +378,12 @@ class EMAStrategy(BaseStrategy):
         Returns:
             bool: True if EMAs have sufficient separation
         """
-        if self.data.empty or len(self.data) < 2:
+        if len(self._arrays()[0]) < 2:
             return False
             
-        current_fast = self.data['fast_ema'].iloc[-1]
-        current_slow = self.data['slow_ema'].iloc[-1]
-        
-        diff = current_fast - current_slow
-        point = self.get_point_value()
-        diff_points = abs(diff / point)
-        
-        if direction == "BUY":
-            sep_ok = diff > 0 and diff_points >= SIGNAL_FILTERS['MIN_SEPARATION_POINTS']
-        else:  # SELL
-            sep_ok = diff < 0 and diff_points >= SIGNAL_FILTERS['MIN_SEPARATION_POINTS']
-            
-        return sep_ok
+        return self._validate_signal(direction)[1]
     
-    def check_price_confirmation(self, direction="BUY"):
+    def check_price_confirmation(self, direction: str = "BUY") -> bool:
         """
         Check if price confirms the signal direction
         Relaxed to check only against slow EMA
@@ -142,20 +394,10 @@ class EMAStrategy(BaseStrategy):
         Returns:
             bool: True if price confirms signal direction
         """
-        if self.data.empty or len(self.data) < 1:
+        if len(self._arrays()[3]) < 1:
             return False
             
-        last_close = self.data['close'].iloc[-1]
-        slow_ema = self.data['slow_ema'].iloc[-1]
-        
-        if direction == "BUY":
-            # Relaxed condition: only need to be above the slow EMA for BUY
-            price_ok = last_close > slow_ema
-        else:  # SELL
-            # Relaxed condition: only need to be below the slow EMA for SELL
-            price_ok = last_close < slow_ema
-            
-        return price_ok
+        return self._validate_signal(direction)[2]
     
     def is_time_in_candle(self, time_to_check, candle_time):
         """
@@ -172,14 +414,20 @@ class EMAStrategy(BaseStrategy):
             return False
             
         try:
-            # Get the boundaries of the candle containing candle_time
-            candle_start, candle_end = get_candle_boundaries(candle_time, self.timeframe)
+            if self._tf_ns is None:
+                candle_start, candle_end = get_candle_boundaries(candle_time, self.timeframe)
+                return candle_start <= time_to_check < candle_end
+                
+            # Compare as int64 epoch nanoseconds (naive times are taken as UTC, like
+            # get_candle_boundaries) with the candle placed on the timeframe grid
+            check_ns = pd.Timestamp(time_to_check).value
+            candle_start = pd.Timestamp(candle_time).value // self._tf_ns * self._tf_ns
             
-            # Check if time_to_check falls within these boundaries
-            return candle_start <= time_to_check < candle_end
+            # Check if time_to_check falls within the candle containing candle_time
+            return candle_start <= check_ns < candle_start + self._tf_ns
             
         except Exception as e:
-            print(f"⚠️ Error in is_time_in_candle: {e}. Assuming times are not in the same candle.")
+            log.warning("⚠️ Error in is_time_in_candle: %s. Assuming times are not in the same candle.", e)
             return False
     
     def is_last_trade_in_current_candle(self):
@@ -209,19 +457,24 @@ class EMAStrategy(BaseStrategy):
             # If no previous trade or no data, consider all candles
             return list(range(len(self.data)))
             
-        # Get candles that started after the last trade close time
-        post_trade_candles = []
-        for i in range(len(self.data)):
-            candle_time = self.data.index[i]
-            candle_start, _ = get_candle_boundaries(candle_time, self.timeframe)
+        # Candle start of every bar as int64 epoch ns; rebuilt only when self.data
+        # has been replaced
+        if self._candle_starts_source is not self.data:
+            if self._tf_ns is None:
+                self._candle_starts = np.array([
+                    pd.Timestamp(get_candle_boundaries(candle_time, self.timeframe)[0]).value
+                    for candle_time in self.data.index], dtype=np.int64)
+            else:
+                index_ns = self.data.index.as_unit('ns').asi8
+                self._candle_starts = index_ns // self._tf_ns * self._tf_ns
+            self._candle_starts_source = self.data
             
-            # If candle started after the trade closed, include it
-            if candle_start > self.last_trade_close_time:
-                post_trade_candles.append(i)
-                
-        return post_trade_candles
+        # Starts are sorted, so the candles that started after the trade closed form a suffix
+        close_ns = pd.Timestamp(self.last_trade_close_time).value
+        first = int(np.searchsorted(self._candle_starts, close_ns, side='right'))
+        return list(range(first, len(self.data)))
         
-    def detect_recent_crossover(self):
+    def detect_recent_crossover(self) -> Tuple[bool, Optional[int], Optional[str], Optional[int]]:
         """
         Check if a crossover occurred in the last few candles
         
@@ -234,57 +487,35 @@ class EMAStrategy(BaseStrategy):
         potential_signal = None
         candles_ago = None
         
+        _, _, diff, _ = self._arrays()
+        
         # Check if a crossover happened within the last few candles
-        lookback = min(SIGNAL_FILTERS['LOOKBACK_CANDLES'], len(self.data)-1)
-        
-        for i in range(1, lookback+1):
-            idx_fast = self.data['fast_ema'].iloc[-i]
-            idx_slow = self.data['slow_ema'].iloc[-i]
-            prev_idx_fast = self.data['fast_ema'].iloc[-(i+1)]
-            prev_idx_slow = self.data['slow_ema'].iloc[-(i+1)]
-            
-            # BUY crossover within last few candles
-            if prev_idx_fast <= prev_idx_slow and idx_fast > idx_slow:
-                crossover_detected = True
-                if not self.prev_signal or self.prev_signal == mt5.ORDER_TYPE_SELL:
-                    potential_signal = "BUY"
-                    signal_type = mt5.ORDER_TYPE_BUY
-                    candles_ago = i
-                    print(f"\n📊 Recent BUY Crossover detected {i} candles ago")
-                    return crossover_detected, signal_type, potential_signal, candles_ago
-                    
-            # SELL crossover within last few candles
-            elif prev_idx_fast >= prev_idx_slow and idx_fast < idx_slow:
-                crossover_detected = True
-                if not self.prev_signal or self.prev_signal == mt5.ORDER_TYPE_BUY:
-                    potential_signal = "SELL"
-                    signal_type = mt5.ORDER_TYPE_SELL
-                    candles_ago = i
-                    print(f"\n📊 Recent SELL Crossover detected {i} candles ago")
-                    return crossover_detected, signal_type, potential_signal, candles_ago
-                    
-        # Check for immediate crossover (most recent candle)
-        current_fast = self.data['fast_ema'].iloc[-1]
-        current_slow = self.data['slow_ema'].iloc[-1]
-        prev_fast = self.data['fast_ema'].iloc[-2]
-        prev_slow = self.data['slow_ema'].iloc[-2]
-        
-        if prev_fast <= prev_slow and current_fast > current_slow:
-            crossover_detected = True
-            if not self.prev_signal or self.prev_signal == mt5.ORDER_TYPE_SELL:
+        lookback = min(LOOKBACK_CANDLES, len(diff)-1)
+        
+        # Fast EMA strictly on one side of the slow EMA across the whole window: no crossover
+        # is possible, so skip the scan (the common case outside of a cross)
+        tail_diff = diff[-(lookback+1):]
+        if (tail_diff > 0).all() or (tail_diff < 0).all():
+            return crossover_detected, signal_type, potential_signal, candles_ago
+        
+        buy_allowed = not self.prev_signal or self.prev_signal == _OT_SELL
+        sell_allowed = not self.prev_signal or self.prev_signal == _OT_BUY
+        
+        # Most recent crossover whose direction is allowed by the previous signal
+        i, direction, crossover_detected = detect_crossover(diff, lookback, buy_allowed, sell_allowed)
+        if direction != 0:
+            candles_ago = int(i)
+            if direction > 0:
                 potential_signal = "BUY"
-                signal_type = mt5.ORDER_TYPE_BUY
-                candles_ago = 0
-                print(f"\n📊 Analyzing BUY Signal (immediate crossover)")
-                
-        elif prev_fast >= prev_slow and current_fast < current_slow:
-            crossover_detected = True
-            if not self.prev_signal or self.prev_signal == mt5.ORDER_TYPE_BUY:
+                signal_type = _OT_BUY
+            else:
                 potential_signal = "SELL"
-                signal_type = mt5.ORDER_TYPE_SELL
-                candles_ago = 0
-                print(f"\n📊 Analyzing SELL Signal (immediate crossover)")
-                
+                signal_type = _OT_SELL
+            log.info("\n📊 Recent %s Crossover detected %d candles ago", potential_signal, candles_ago)
+            return True, signal_type, potential_signal, candles_ago
+        
+        # The scan covers the latest candle too (candles_ago 1), so a disallowed or
+        # missing crossover there leaves nothing more to report
         return crossover_detected, signal_type, potential_signal, candles_ago
         
     def generate_entry_signal(self, open_positions=None):
@@ -300,7 +531,8 @@ class EMAStrategy(BaseStrategy):
             tuple or None: (signal_type, entry_price, None, None) or None
             The SL/TP will be calculated later based on actual entry price
         """
-        if self.data.empty or len(self.data) < 10:  # Need at least 10 candles
+        fe, se, diff, cl = self._arrays()
+        if len(fe) < 10:  # Need at least 10 candles
             return None
             
         # Check if the previous signal is still valid (detects SL/TP closures)
@@ -309,38 +541,54 @@ class EMAStrategy(BaseStrategy):
             
         # Check if last trade close time is in the current candle - if so, skip generating signals
         if self.is_last_trade_in_current_candle():
-            print(f"⏳ Waiting for next candle after position close at {self.last_trade_close_time}")
+            log.info("⏳ Waiting for next candle after position close at %s", self.last_trade_close_time)
             return None
             
-        # Get current EMA values for logging
-        current_fast = self.data['fast_ema'].iloc[-1]
-        current_slow = self.data['slow_ema'].iloc[-1]
-        prev_fast = self.data['fast_ema'].iloc[-2]
-        prev_slow = self.data['slow_ema'].iloc[-2]
-        point = self.get_point_value()
+        # When polled faster than the bar closes, skip the pipeline if nothing it reads has
+        # changed since the last check that found no signal - it would find none again
+        bar_time = self.data.index[-1]
+        seen_values = (fe[-1], se[-1], cl[-1], self.prev_signal, self.last_trade_close_time)
+        if bar_time == self._last_seen_bar_time and seen_values == self._last_seen_values:
+            return None
             
-        # Try to detect a recent crossover
-        crossover_detected, signal_type, potential_signal, candles_ago = self.detect_recent_crossover()
+        # Get current EMA values for logging
+        current_fast = fe[-1]
+        current_slow = se[-1]
+        
+        buy_allowed = not self.prev_signal or self.prev_signal == _OT_SELL
+        sell_allowed = not self.prev_signal or self.prev_signal == _OT_BUY
+        
+        # Recent-crossover scan and slope/separation/price filters in a single kernel call
+        direction, candles_ago, slope_ok, sep_ok, price_ok, diff_points = entry_signal(
+            fe, se, diff, cl, min(LOOKBACK_CANDLES, len(fe)-1),
+            buy_allowed, sell_allowed, SLOPE_PERIODS, MIN_SLOPE_THRESHOLD,
+            MIN_SEPARATION_POINTS, self._inv_point)
         
         # If we have a potential signal from crossover, analyze it
-        if potential_signal:
+        if direction != 0:
+            if direction > 0:
+                potential_signal = "BUY"
+                signal_type = _OT_BUY
+            else:
+                potential_signal = "SELL"
+                signal_type = _OT_SELL
+            log.info("\n📊 Recent %s Crossover detected %d candles ago", potential_signal, candles_ago)
+            
             diff_value = current_fast - current_slow
-            diff_points = abs(diff_value / point)
             
             # Log current state
-            print(f"   Current Candle: Fast EMA = {current_fast:.5f}, Slow EMA = {current_slow:.5f} (Diff: {diff_value:.5f})")
-            print(f"   Signal Strength: {diff_points:.1f} points (min required: {SIGNAL_FILTERS['MIN_CROSSOVER_POINTS']})")
-            
-            # Check conditions specific to signal type
-            slope_ok = self.check_slope_conditions(potential_signal)
-            price_ok = self.check_price_confirmation(potential_signal)
-            
-            print(f"Slope: {'✅' if slope_ok else '❌'}, Price: {'✅' if price_ok else '❌'}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("   Current Candle: Fast EMA = %.5f, Slow EMA = %.5f (Diff: %.5f)",
+                          current_fast, current_slow, diff_value)
+                log.debug("   Signal Strength: %.1f points (min required: %s)",
+                          diff_points, MIN_CROSSOVER_POINTS)
+                log.debug("Slope: %s, Separation: %s, Price: %s",
+                          '✅' if slope_ok else '❌', '✅' if sep_ok else '❌', '✅' if price_ok else '❌')
             
             # Validate crossover signal
             if slope_ok and price_ok:
                 valid_signal = True
-                print(f"\n🚀 VALID {potential_signal} SIGNAL - Crossover with confirming slope and price")
+                log.info("\n🚀 VALID %s SIGNAL - Crossover with confirming slope and price", potential_signal)
                 
                 # Get appropriate market price for entry
                 entry_price = self.get_market_price(signal_type)
@@ -351,8 +599,31 @@ class EMAStrategy(BaseStrategy):
                 # Return signal info - SL/TP will be calculated by TradeExecutor
                 return signal_type, entry_price, None, None
         
+        self._last_seen_bar_time = bar_time
+        self._last_seen_values = seen_values
         return None
     
+    def bar_crossover_flags(self) -> Tuple[bool, bool]:
+        """
+        Crossover state of the latest candle, shared by every position checked on it.
+        
+        Computed once per buffer refresh (calculate_indicators / on_new_bar) and reused
+        until the buffer changes again, so checking many positions costs one comparison.
+        
+        Returns:
+            tuple: (crossed_down, crossed_up) - fast EMA crossed below / above the slow EMA
+        """
+        _, _, diff, _ = self._arrays()
+        if self._bar_flags is None:
+            if len(diff) < 2:
+                self._bar_flags = (False, False)
+            else:
+                # Two sign tests on the EMA gap of the last two candles
+                prev_diff = diff[-2]
+                curr_diff = diff[-1]
+                self._bar_flags = (bool(prev_diff >= 0 > curr_diff), bool(prev_diff <= 0 < curr_diff))
+        return self._bar_flags
+        
     def generate_exit_signal(self, position):
         """
         Generate exit signals based on EMA crossover logic if enabled in configuration.
@@ -373,30 +644,48 @@ class EMAStrategy(BaseStrategy):
             return False
             
         # If EMA exit signals are enabled, use the original EMA crossover logic
-        if self.data.empty or len(self.data) < 2:
-            return False
-            
-        # Get current and previous EMA values
-        current_fast = self.data['fast_ema'].iloc[-1]
-        current_slow = self.data['slow_ema'].iloc[-1]
-        prev_fast = self.data['fast_ema'].iloc[-2]
-        prev_slow = self.data['slow_ema'].iloc[-2]
+        crossed_down, crossed_up = self.bar_crossover_flags()
         
         # Check for crossover against our position
         position_type = position.type  # 0 for Buy, 1 for Sell
         
         # Exit BUY position if Fast EMA crosses below Slow EMA
-        if position_type == mt5.POSITION_TYPE_BUY and prev_fast >= prev_slow and current_fast < current_slow:
-            print(f"⚠️ EXIT SIGNAL: Fast EMA crossed below Slow EMA - Close BUY position")
+        if position_type == _PT_BUY and crossed_down:
+            log.info("⚠️ EXIT SIGNAL: Fast EMA crossed below Slow EMA - Close BUY position")
             return True
             
         # Exit SELL position if Fast EMA crosses above Slow EMA
-        if position_type == mt5.POSITION_TYPE_SELL and prev_fast <= prev_slow and current_fast > current_slow:
-            print(f"⚠️ EXIT SIGNAL: Fast EMA crossed above Slow EMA - Close SELL position")
+        if position_type == _PT_SELL and crossed_up:
+            log.info("⚠️ EXIT SIGNAL: Fast EMA crossed above Slow EMA - Close SELL position")
             return True
             
         return False
         
+    def generate_exit_signals_batch(self, fe, se, position_types):
+        """
+        Vectorized generate_exit_signal over a whole series, for backtests.
+        
+        Args:
+            fe (ndarray): Fast EMA values
+            se (ndarray): Slow EMA values
+            position_types (ndarray): Open position type at each bar
+                                      (mt5.POSITION_TYPE_BUY / mt5.POSITION_TYPE_SELL, or -1 for none)
+            
+        Returns:
+            ndarray: bool array, True where the position open at that bar should be closed
+        """
+        exits = np.zeros(len(fe), dtype=bool)
+        if not EMA_STRATEGY_CONFIG['USE_EMA_EXIT_SIGNALS'] or len(fe) < 2:
+            return exits
+            
+        codes = crossover_codes(np.array(fe, dtype=np.float64) - np.array(se, dtype=np.float64))
+        position_types = np.asarray(position_types)[1:]
+        
+        # Close BUYs when fast crosses below slow, SELLs when it crosses above
+        exits[1:] = (((position_types == _PT_BUY) & (codes < 0)) |
+                     ((position_types == _PT_SELL) & (codes > 0)))
+        return exits
+        
     def reset_signal_state(self):
         """
         Reset strategy internal state after position closing or failed orders.
@@ -408,11 +697,13 @@ class EMAStrategy(BaseStrategy):
         if not self.data.empty:
             # Use the timestamp of the current candle
             self.last_trade_close_time = current_server_time
-            print(f"🕒 Position closed at {self.last_trade_close_time}. Waiting for next candle and new trend formation before new entry.")
+            log.info("🕒 Position closed at %s. Waiting for next candle and new trend formation before new entry.",
+                     self.last_trade_close_time)
         else:
             # If no data available, use server time
             self.last_trade_close_time = current_server_time
-            print(f"🕒 Position closed at {self.last_trade_close_time} (server time). Waiting for next candle and new trend formation before new entry.")
+            log.info("🕒 Position closed at %s (server time). Waiting for next candle and new trend formation before new entry.",
+                     self.last_trade_close_time)
             
         # Call the parent class method to reset other state
         super().reset_signal_state()
@@ -431,7 +722,7 @@ class EMAStrategy(BaseStrategy):
         # If we have prev_signal but no open positions, the position must have been closed externally
         # via SL/TP or manual intervention
         if self.prev_signal is not None and not open_positions:
-            print(f"🔄 Detected position closed by SL/TP or manually. Resetting signal state.")
+            log.info("🔄 Detected position closed by SL/TP or manually. Resetting signal state.")
             self.reset_signal_state()
             return True
         return False 
\ No newline at end of file
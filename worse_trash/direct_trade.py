@@ -1,5 +1,6 @@
 import MetaTrader5 as mt5
 import argparse
+import logging
 import time
 from datetime import datetime
 
@@ -11,6 +12,13 @@ SERVER = "PUPrime-Demo"
 # Strategy parameters (matching EMA strategy)
 RISK_PERCENTAGE = 0.01  # 1% risk per trade
 
+# Diagnostics go through this logger at DEBUG level (enable with --debug), so their
+# formatting is skipped entirely when they are off
+log = logging.getLogger(__name__)
+
+# order_send retcodes accepted as success: TRADE_RETCODE_DONE (10009) and 10027
+_OK_RETCODES = frozenset((10009, 10027))
+
 def calculate_position_size(account_balance, risk_percentage, entry_price, stop_loss, symbol_info):
     risk_amount = account_balance * risk_percentage
     price_risk = abs(entry_price - stop_loss)
@@ -21,27 +29,27 @@ def calculate_position_size(account_balance, risk_percentage, entry_price, stop_
 
 def is_trade_successful(result):
     """Check if a trade was successful based on MT5's result"""
-    return (
-        result and result.retcode in [10009, 10027] 
-        or str(mt5.last_error()) == "(1, 'Success')"
-    ) and result.deal > 0
+    return result is not None and is_modification_successful(result) and result.deal > 0
 
 def is_modification_successful(result):
     """Check if a modification was successful based on MT5's result"""
     # For modifications, we don't need to check deal > 0
-    return (
-        result and result.retcode in [10009, 10027] 
-        or str(mt5.last_error()) == "(1, 'Success')"
-    )
-
-def calculate_stop_distance(price, risk_percentage, symbol_info):
-    """Calculate stop distance based on risk percentage of current price"""
-    # Use 1% of price as base distance, but ensure it respects minimum stops
-    base_distance = price * risk_percentage
-    min_stop_distance = symbol_info.trade_stops_level * symbol_info.point
-    
-    # Use whichever is larger
-    return max(base_distance, min_stop_distance)
+    # (last_error code 1 is RES_S_OK, only consulted when the retcode isn't a success)
+    return (result is not None and result.retcode in _OK_RETCODES) or mt5.last_error()[0] == 1
+
+def find_deal_position(result, retries=1, delay=0.1):
+    """Find the position opened by a filled order via its deal, retrying briefly if it hasn't appeared yet"""
+    for attempt in range(retries + 1):
+        # The deal knows its position; fall back to the order ticket, which is the
+        # position ticket on hedging accounts
+        deals = mt5.history_deals_get(ticket=result.deal)
+        position_id = deals[0].position_id if deals else result.order
+        positions = mt5.positions_get(ticket=position_id)
+        if positions:
+            return positions[0]
+        if attempt < retries:
+            time.sleep(delay)
+    return None
 
 def try_trade_with_symbol(symbol, action, volume):
     """Execute a trade with the given symbol and handle stop loss/take profit"""
@@ -52,22 +60,18 @@ def try_trade_with_symbol(symbol, action, volume):
         return False
     
     digits = symbol_info.digits
+    # Broker's minimum stop distance in price units (symbol-static)
+    min_stop_distance = symbol_info.trade_stops_level * symbol_info.point
 
-    # Get the current price
-    price = mt5.symbol_info_tick(symbol).ask if action == "buy" else mt5.symbol_info_tick(symbol).bid
+    # Get the current price (one tick snapshot, used for the order and the SL/TP levels)
+    tick = mt5.symbol_info_tick(symbol)
+    price = (tick.ask if action == "buy" else tick.bid) if tick is not None else None
     if not price:
         print("Failed to get current price")
         return False
 
     print(f"Executing {action.upper()} at price: {price}")
 
-    # Store initial positions to compare later
-    initial_positions = mt5.positions_get(symbol=symbol)
-    initial_position_tickets = set()
-    if initial_positions:
-        initial_position_tickets = {pos.ticket for pos in initial_positions}
-        print(f"Initial positions: {initial_position_tickets}")
-
     # Create trade request without SL/TP first
     request = {
         "action": mt5.TRADE_ACTION_DEAL,
@@ -90,42 +94,22 @@ def try_trade_with_symbol(symbol, action, volume):
 
     print(f"Trade executed successfully! Deal #{result.deal}")
 
-    # Now find the new position by comparing with initial positions
-    position = None
-    print("\nSearching for new position...")
-    for i in range(10):  # Try a few times to get the position
-        positions = mt5.positions_get(symbol=symbol)
-        if positions is None:
-            print(f"Failed to get positions, error: {mt5.last_error()}")
-            continue
-            
-        print(f"Found {len(positions)} total positions")
-        if positions:
-            # Look for a position that wasn't in our initial set
-            for pos in positions:
-                print(f"Checking position: Ticket #{pos.ticket}, Type: {'Buy' if pos.type == mt5.POSITION_TYPE_BUY else 'Sell'}, Time: {pos.time}")
-                if pos.ticket not in initial_position_tickets:
-                    position = pos
-                    print(f"Found new position #{pos.ticket}")
-                    break
-        if position:
-            break
-        print(f"New position not found, attempt {i+1}/10")
-        time.sleep(0.1)
+    # Now find the new position through the deal that opened it
+    position = find_deal_position(result)
+    if position:
+        log.debug("Found new position #%s", position.ticket)
 
     if not position:
         print("Warning: Could not find position to modify SL/TP")
         return True  # Trade was still successful
 
     # Calculate SL and TP based on risk percentage
-    print(f"\nCalculating SL/TP levels:")
-    print(f"Symbol point: {symbol_info.point}")
-    print(f"Minimum stop level: {symbol_info.trade_stops_level} points")
-    print(f"Contract size: {symbol_info.trade_contract_size}")
+    log.debug("Calculating SL/TP levels: point %s, minimum stop level %s points, contract size %s",
+              symbol_info.point, symbol_info.trade_stops_level, symbol_info.trade_contract_size)
     
-    # Calculate stop distance based on risk percentage (default 1%)
-    stop_distance = calculate_stop_distance(price, 0.01, symbol_info)
-    print(f"Stop distance: {stop_distance} ({stop_distance / symbol_info.point:.1f} points)")
+    # Stop distance is 1% of price, but never inside the broker's minimum stop distance
+    stop_distance = max(price * RISK_PERCENTAGE, min_stop_distance)
+    log.debug("Stop distance: %s (%.1f points)", stop_distance, stop_distance / symbol_info.point)
     
     if action == "buy":
         sl = price - stop_distance
@@ -138,9 +122,10 @@ def try_trade_with_symbol(symbol, action, volume):
     sl = round(sl, digits)
     tp = round(tp, digits)
 
-    print(f"Entry Price: {price}")
-    print(f"Stop Loss: {sl} ({abs(price - sl)} distance, {abs(price - sl) / price * 100:.2f}% from entry)")
-    print(f"Take Profit: {tp} ({abs(price - tp)} distance, {abs(price - tp) / price * 100:.2f}% from entry)")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Entry Price: %s", price)
+        log.debug("Stop Loss: %s (%s distance, %.2f%% from entry)", sl, abs(price - sl), abs(price - sl) / price * 100)
+        log.debug("Take Profit: %s (%s distance, %.2f%% from entry)", tp, abs(price - tp), abs(price - tp) / price * 100)
 
     # Create modify request
     modify_request = {
@@ -151,7 +136,7 @@ def try_trade_with_symbol(symbol, action, volume):
         "position": position.ticket
     }
 
-    print("\nSending modify request...")
+    log.debug("Sending modify request...")
     modify_result = mt5.order_send(modify_request)
     
     if modify_result is None:
@@ -159,8 +144,7 @@ def try_trade_with_symbol(symbol, action, volume):
         print(f"Last error: {mt5.last_error()}")
         return True
         
-    print(f"Modification result - Retcode: {modify_result.retcode}")
-    print(f"Modification comment: {modify_result.comment}")
+    log.debug("Modification result - Retcode: %s, comment: %s", modify_result.retcode, modify_result.comment)
     
     if not is_modification_successful(modify_result):
         print(f"Failed to set SL/TP: {mt5.last_error()}")
@@ -211,13 +195,16 @@ def execute_direct_trade(symbol, action, volume=None):
     # Gracefully disconnect
     mt5.shutdown()
 
+# Command-line interface, built once at import
+_PARSER = argparse.ArgumentParser(description='Test MT5 trading with direct approach')
+_PARSER.add_argument('symbol', help='Trading symbol (e.g., XAUUSD.s)')
+_PARSER.add_argument('action', choices=['buy', 'sell'], help='Trade action')
+_PARSER.add_argument('--volume', type=float, help='Trading volume (optional, will calculate based on risk if not provided)')
+_PARSER.add_argument('--debug', action='store_true', help='Print order diagnostics')
+
 def main():
-    parser = argparse.ArgumentParser(description='Test MT5 trading with direct approach')
-    parser.add_argument('symbol', help='Trading symbol (e.g., XAUUSD.s)')
-    parser.add_argument('action', choices=['buy', 'sell'], help='Trade action')
-    parser.add_argument('--volume', type=float, help='Trading volume (optional, will calculate based on risk if not provided)')
-    
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING, format='%(message)s')
     
     print(f"Testing {args.action.upper()} trade for {args.symbol}")
     execute_direct_trade(args.symbol, args.action, args.volume)
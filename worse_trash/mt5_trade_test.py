@@ -283,13 +283,14 @@ def test_trade(symbol, action, volume=0.01):
     # Gracefully disconnect
     mt5.shutdown()
 
+# Command-line interface, built once at import
+_PARSER = argparse.ArgumentParser(description='Test MT5 trading with different approaches')
+_PARSER.add_argument('symbol', help='Trading symbol (e.g., XAUUSD.s)')
+_PARSER.add_argument('action', choices=['buy', 'sell'], help='Trade action')
+_PARSER.add_argument('--volume', type=float, default=0.01, help='Trading volume (default: 0.01)')
+
 def main():
-    parser = argparse.ArgumentParser(description='Test MT5 trading with different approaches')
-    parser.add_argument('symbol', help='Trading symbol (e.g., XAUUSD.s)')
-    parser.add_argument('action', choices=['buy', 'sell'], help='Trade action')
-    parser.add_argument('--volume', type=float, default=0.01, help='Trading volume (default: 0.01)')
-    
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
     
     print(f"Testing {args.action.upper()} trade for {args.symbol}")
     test_trade(args.symbol, args.action, args.volume)
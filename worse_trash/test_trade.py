@@ -84,13 +84,16 @@ def execute_trade(symbol, action, volume=0.01):
     print(f"Volume: {volume}")
     print(f"Stop Distance: {stop_distance/point:.1f} points")
     
-    # First, execute the market order without SL/TP
+    # Execute the market order with SL/TP attached, so the trade opens protected in a
+    # single round trip to the broker
     request = {
         "action": mt5.TRADE_ACTION_DEAL,
         "symbol": symbol,
         "volume": volume,
         "type": order_type,
         "price": entry_price,
+        "sl": stop_loss,
+        "tp": take_profit,
         "deviation": 10,
         "magic": 123456,
         "comment": f"Test {action} trade",
@@ -101,6 +104,14 @@ def execute_trade(symbol, action, volume=0.01):
     # Execute trade
     result = mt5.order_send(request)
     
+    # Some brokers reject stops on market orders; open without them and set them afterwards
+    sltp_pending = False
+    if result.retcode == mt5.TRADE_RETCODE_INVALID_STOPS:
+        print("⚠️ Broker rejected SL/TP on the market order, retrying without them")
+        del request["sl"], request["tp"]
+        result = mt5.order_send(request)
+        sltp_pending = True
+    
     # Check result
     if result.retcode != mt5.TRADE_RETCODE_DONE:
         print(f"❌ Trade failed, retcode: {result.retcode}")
@@ -110,7 +121,14 @@ def execute_trade(symbol, action, volume=0.01):
     
     print(f"✅ Trade executed: {action.upper()} at {entry_price}")
     
-    # Now modify the position to add SL/TP
+    if not sltp_pending:
+        print("✅ Stop Loss and Take Profit set with the order")
+        print(f"Stop Loss: {stop_loss}")
+        print(f"Take Profit: {take_profit}")
+        mt5.shutdown()
+        return
+    
+    # Fallback: modify the position to add SL/TP
     position = mt5.positions_get(symbol=symbol)
     if position:
         position = position[0]  # Get the first position